@@ -7,15 +7,25 @@ Version: 1.0.0
 
 import sys
 import os
-from datetime import datetime
-from typing import Optional
-from openai import OpenAI
+import re
+import copy
+import asyncio
+import hashlib
+import threading
+from functools import lru_cache, wraps
+from itertools import islice
+from typing import Iterator, Optional
+
+# openai, httpx and tenacity are imported where they are first needed, so
+# startup (and --help / --version) doesn't pay for them
 
 from config import Config
 from prompts import Prompts
 from utils import (
-    read_file, write_file, generate_filename,
-    count_words, estimate_tokens, truncate_text,
+    read_file, write_file, write_all, open_output_file, generate_filename,
+    aread_file, awrite_file, aopen_output_file, iter_text_files,
+    count_words, get_encoder, estimate_tokens, count_tokens_batch, truncate_text,
+    dumps_jsonl, loads_json, format_now, RecentIndex,
     print_success, print_error, print_info, print_warning,
     format_output_separator
 )
@@ -23,6 +33,197 @@ from utils import (
 __version__ = "1.0.0"
 __author__ = "Oleg"
 
+# Output type -> (file base name, extension)
+OUTPUT_FILES = {
+    'summary': ("meeting_summary", "md"),
+    'email': ("meeting_followup_email", "txt"),
+    'brief': ("executive_brief", "txt")
+}
+
+# Output token cap for each output
+TASK_MAX_TOKENS = {
+    'summary': Config.SUMMARY_MAX_TOKENS,
+    'email': Config.EMAIL_MAX_TOKENS,
+    'brief': Config.BRIEF_MAX_TOKENS,
+    'email_and_brief': Config.EMAIL_MAX_TOKENS + Config.BRIEF_MAX_TOKENS
+}
+
+# A word, as str.split() sees it
+_WORD_RE = re.compile(r"\S+")
+
+
+async def _noop():
+    """Placeholder coroutine for optional steps that were not requested"""
+    return None
+
+
+async def _closing(summarizer, coro):
+    """Await a summarizer coroutine, then close the summarizer's clients"""
+    try:
+        return await coro
+    finally:
+        await summarizer.aclose()
+
+
+def _retry_after(retry_state) -> Optional[float]:
+    """Seconds the server's Retry-After header asks us to wait (capped at 60), if it sent one"""
+    error = retry_state.outcome.exception()
+    response = getattr(error, 'response', None)
+    
+    if response is not None:
+        try:
+            return min(float(response.headers.get('retry-after')), 60.0)
+        except (TypeError, ValueError):
+            pass
+    
+    return None
+
+
+def _log_retry(retry_state):
+    """Tell the user a call is being retried"""
+    summarizer = retry_state.args[0]
+    if summarizer.verbose:
+        error = retry_state.outcome.exception()
+        print_warning(f"API call failed ({error}), retrying in {retry_state.next_action.sleep:.1f}s...")
+
+
+@lru_cache(maxsize=None)
+def _with_retries(func):
+    """Wrap a function in the tenacity retry policy (built on first use)"""
+    import openai
+    from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
+    
+    # Errors worth retrying: rate limits, network problems (including
+    # timeouts, a subclass of APIConnectionError) and server-side failures
+    retryable_errors = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+    backoff = wait_exponential_jitter(initial=1, max=30)
+    
+    def wait(retry_state) -> float:
+        """Wait as long as Retry-After asks, else back off exponentially"""
+        delay = _retry_after(retry_state)
+        return delay if delay is not None else backoff(retry_state)
+    
+    return retry(
+        retry=retry_if_exception_type(retryable_errors),
+        stop=stop_after_attempt(Config.MAX_RETRIES),
+        wait=wait,
+        before_sleep=_log_retry,
+        reraise=True
+    )(func)
+
+
+def retry_api_call(func):
+    """
+    Decorator: retry an API call on transient errors
+    
+    The tenacity wrapper is only built on the first call, so decorating
+    methods doesn't import tenacity or openai.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await _with_retries(func)(*args, **kwargs)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return _with_retries(func)(*args, **kwargs)
+    
+    return wrapper
+
+
+def _http_client_options() -> dict:
+    """Connection pool settings shared by the sync and async HTTP clients"""
+    import importlib.util
+    import httpx
+    
+    return {
+        # HTTP/2 needs the optional h2 package
+        'http2': importlib.util.find_spec("h2") is not None,
+        'limits': httpx.Limits(
+            max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=Config.MAX_CONNECTIONS
+        ),
+        'timeout': httpx.Timeout(Config.REQUEST_TIMEOUT, connect=Config.CONNECT_TIMEOUT)
+    }
+
+
+# Async clients shared by all summarizers, one per event loop (an
+# AsyncClient's connections belong to the loop that opened them)
+_async_clients = {}
+
+# Caps on in-flight async requests, also one per event loop and shared by
+# all summarizers, so bursts queue up instead of hitting 429s
+_request_semaphores = {}
+
+
+def _get_async_client():
+    """
+    Get the shared AsyncOpenAI client for the running event loop, creating it on first use
+    
+    No lock is needed: creation never awaits, so two tasks on the same loop
+    can't both get past the check.
+    """
+    loop = asyncio.get_running_loop()
+    
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        from openai import AsyncOpenAI
+        
+        # Retries are handled by retry_api_call, so the SDK's own are disabled
+        client = AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(**_http_client_options()),
+            max_retries=0
+        )
+        _async_clients[loop] = client
+    
+    return client
+
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """Get the running event loop's request limiter (Config.MAX_CONCURRENCY slots)"""
+    loop = asyncio.get_running_loop()
+    
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENCY)
+        _request_semaphores[loop] = semaphore
+    
+    return semaphore
+
+
+async def _aclose_async_client():
+    """Close the running event loop's shared async client, if one was created"""
+    loop = asyncio.get_running_loop()
+    _request_semaphores.pop(loop, None)
+    
+    client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+def run_async(coro):
+    """
+    Run a coroutine with asyncio.run, then close that loop's shared async client
+    
+    For summarizers that stay open across runs (e.g. cached by the web UI);
+    otherwise each run would leave an unusable client behind.
+    
+    Args:
+        coro: Coroutine to run (e.g. summarizer.aprocess_meeting(...))
+        
+    Returns:
+        The coroutine's result
+    """
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await _aclose_async_client()
+    
+    return asyncio.run(_run())
+
 
 class MeetingSummarizer:
     """
@@ -34,169 +235,1067 @@ class MeetingSummarizer:
     - Optional executive brief
     """
     
-    def __init__(self, model: str = None, verbose: bool = True):
+    def __init__(self, model: str = None, verbose: bool = True, cache_mode: str = None, small_model: str = None):
         """
         Initialize the Meeting Summarizer
         
         Args:
             model: AI model to use (default from config)
             verbose: Whether to print progress messages
+            cache_mode: "off", "exact" or "semantic" (default from config)
+            small_model: Model for summarizing short notes (default from
+                config, where None always uses model)
         """
+        Config.validate()
+        
         self.model = model or Config.DEFAULT_MODEL
+        self.small_model = small_model or Config.SMALL_MODEL
         self.verbose = verbose
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
         
-        # Cost tracking
+        import httpx
+        from openai import OpenAI
+        
+        # Persistent connection pool, reused by every call (the async client
+        # is shared module-wide, see _get_async_client)
+        # Retries are handled by retry_api_call, so the SDK's own are disabled
+        self.client = OpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=httpx.Client(**_http_client_options()),
+            max_retries=0
+        )
+        
+        # Response caches: exact match first, then (in semantic mode) similarity
+        self.cache_mode = cache_mode or Config.CACHE_MODE
+        if self.cache_mode not in Config.CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {self.cache_mode} (use one of {', '.join(Config.CACHE_MODES)})")
+        
+        if self.cache_mode != "off":
+            from cache import ExactCache
+            self.cache = ExactCache(Config.CACHE_PATH, Config.CACHE_MEMORY_SIZE)
+        else:
+            self.cache = None
+        
+        # The semantic tier (and numpy with it) is only loaded when enabled
+        if self.cache_mode == "semantic":
+            from cache import SemanticCache
+            self.semantic_cache = SemanticCache(Config.SEMANTIC_CACHE_PATH, Config.SEMANTIC_CACHE_TTL_DAYS)
+        else:
+            self.semantic_cache = None
+        
+        # Cost tracking (the lock keeps totals right when threads share a summarizer)
+        self._usage_lock = threading.Lock()
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.api_calls = 0
+        self.cache_hits = 0
+        self.tokens_by_model = {}
         
         # Pricing (per 1K tokens) - Updated prices as of 2024
         self.pricing = {
             'gpt-3.5-turbo': {'input': 0.0015, 'output': 0.002},
             'gpt-4': {'input': 0.03, 'output': 0.06},
-            'gpt-4-turbo': {'input': 0.01, 'output': 0.03}
+            'gpt-4-turbo': {'input': 0.01, 'output': 0.03},
+            'gpt-4o': {'input': 0.0025, 'output': 0.01},
+            'gpt-4o-mini': {'input': 0.00015, 'output': 0.0006}
         }
         
         if self.verbose:
             print_info(f"Initialized Meeting Summarizer with model: {self.model}")
     
-    def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
+    @property
+    def encoder(self):
+        """
+        tiktoken encoder for the current model, or None if unavailable
+        
+        Loaded on first use and cached per model for the whole process, so
+        the BPE tables are only read once and follow later model changes.
+        """
+        return get_encoder(self.model)
+    
+    @property
+    def async_client(self):
+        """The async client shared by every summarizer on the running event loop"""
+        return _get_async_client()
+    
+    def close(self):
+        """Close the HTTP connection pool and cache files"""
+        self.client.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.semantic_cache is not None:
+            self.semantic_cache.close()
+    
+    async def aclose(self):
+        """Close the shared async HTTP connection pool, then everything close() does"""
+        await _aclose_async_client()
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+    
+    def _build_messages(self, prompt: str, system_prompt: str = None, model: str = None) -> list:
+        """Build the chat messages list for a prompt (model is only used for the progress message)"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": prompt})
+        
+        if self.verbose:
+            tokens = estimate_tokens(prompt, self.encoder)
+            print_info(f"Calling {model or self.model} (~{tokens} input tokens)...")
+        
+        return messages
+    
+    def _completion_options(self, task: str = None) -> dict:
+        """
+        Sampling options for a completion request
+        
+        Args:
+            task: 'summary', 'email', 'brief' or 'email_and_brief' to apply
+                that output's token cap (and stop sequence); other requests
+                use MAX_OUTPUT_TOKENS
+        """
+        options = {'temperature': Config.TEMPERATURE}
+        
+        # Shorter caps mean fewer decode steps; without a cap the server's
+        # own limit applies
+        max_tokens = TASK_MAX_TOKENS.get(task) if task else Config.MAX_OUTPUT_TOKENS
+        if max_tokens:
+            options['max_tokens'] = max_tokens
+        
+        if task == 'brief' and Config.BRIEF_STOP:
+            options['stop'] = Config.BRIEF_STOP
+        
+        return options
+    
+    def _record_usage(self, input_tokens: int, output_tokens: int, model: str = None):
+        """Add one API call's token usage to the session totals"""
+        with self._usage_lock:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.api_calls += 1
+            
+            # Per model as well, since short notes may go to the small model
+            tokens = self.tokens_by_model.setdefault(model or self.model, [0, 0])
+            tokens[0] += input_tokens
+            tokens[1] += output_tokens
+    
+    def reset_usage(self):
+        """Start a new cost-tracking session (e.g. for a reused summarizer)"""
+        with self._usage_lock:
+            self.total_input_tokens = 0
+            self.total_output_tokens = 0
+            self.api_calls = 0
+            self.cache_hits = 0
+            self.tokens_by_model = {}
+    
+    def session(self) -> "MeetingSummarizer":
+        """
+        A view of this summarizer with its own cost tracking
+        
+        It shares the HTTP clients and caches, so a summarizer shared across
+        web sessions can still report each run's cost on its own while other
+        sessions use it. Close the shared summarizer, not the session.
+        """
+        session = copy.copy(self)
+        session._usage_lock = threading.Lock()
+        session.reset_usage()
+        return session
+    
+    def _record_cache_hit(self):
+        """Count a response served from a cache"""
+        with self._usage_lock:
+            self.cache_hits += 1
+    
+    def _cache_lookup(self, prompt: str, system_prompt: str = None, model: str = None) -> tuple:
+        """
+        Look up a prompt in the exact-match cache
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            model: Model the response must come from (default: self.model)
+            
+        Returns:
+            Tuple of (cache key or None, cached response or None)
+        """
+        if self.cache is None:
+            return None, None
+        
+        from cache import make_cache_key
+        
+        key = make_cache_key(model or self.model, system_prompt, prompt)
+        cached = self.cache.get(key)
+        
+        if cached is not None:
+            self._record_cache_hit()
+            if self.verbose:
+                print_info("Reusing cached response")
+        
+        return key, cached
+    
+    def _semantic_lookup(self, embedding, model: str = None) -> tuple:
+        """
+        Look up a prompt embedding in the semantic cache
+        
+        Args:
+            embedding: Raw embedding returned by the API
+            model: Model the response must come from (default: self.model)
+            
+        Returns:
+            Tuple of (normalized embedding, cached response or None)
+        """
+        from cache import normalize_embedding
+        
+        embedding = normalize_embedding(embedding)
+        cached = self.semantic_cache.lookup(embedding, model or self.model, Config.SEMANTIC_CACHE_THRESHOLD)
+        
+        if cached is not None:
+            self._record_cache_hit()
+            if self.verbose:
+                print_info("Reusing cached response for a similar prompt")
+        
+        return embedding, cached
+    
+    def _cache_store(self, key: Optional[str], embedding, prompt: str, response: str, model: str = None):
+        """Save a fresh response to whichever caches are enabled"""
+        if key is not None:
+            self.cache.set(key, response)
+        if embedding is not None:
+            self.semantic_cache.add(embedding, prompt, response, model or self.model)
+    
+    @retry_api_call
+    def _create_completion(self, task: str = None, model: str = None, **kwargs):
+        """Send a chat completion request, retrying transient failures"""
+        return self.client.chat.completions.create(model=model or self.model, **self._completion_options(task), **kwargs)
+    
+    @retry_api_call
+    async def _acreate_completion(self, task: str = None, model: str = None, **kwargs):
+        """Async version of _create_completion"""
+        async with _get_request_semaphore():
+            return await self.async_client.chat.completions.create(model=model or self.model, **self._completion_options(task), **kwargs)
+    
+    def _lookup(self, prompt: str, system_prompt: str = None, model: str = None) -> tuple:
+        """
+        Check the enabled caches for a prompt
+        
+        Returns:
+            Tuple of (cache key, normalized embedding, cached response); the
+            key and embedding are needed to store a fresh response afterwards
+        """
+        key, cached = self._cache_lookup(prompt, system_prompt, model)
+        if cached is not None:
+            return key, None, cached
+        
+        embedding = None
+        if self.semantic_cache is not None:
+            result = self.client.embeddings.create(model=Config.EMBEDDING_MODEL, input=prompt)
+            embedding, cached = self._semantic_lookup(result.data[0].embedding, model)
+        
+        return key, embedding, cached
+    
+    async def _alookup(self, prompt: str, system_prompt: str = None, model: str = None) -> tuple:
+        """Async version of _lookup"""
+        key, cached = self._cache_lookup(prompt, system_prompt, model)
+        if cached is not None:
+            return key, None, cached
+        
+        embedding = None
+        if self.semantic_cache is not None:
+            result = await self.async_client.embeddings.create(model=Config.EMBEDDING_MODEL, input=prompt)
+            embedding, cached = self._semantic_lookup(result.data[0].embedding, model)
+        
+        return key, embedding, cached
+    
+    def _call_llm(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        response_format: dict = None,
+        out_path: str = None,
+        task: str = None,
+        model: str = None
+    ) -> str:
         """
         Call the LLM with a prompt
         
         Args:
             prompt: User prompt
             system_prompt: System prompt (optional)
+            response_format: OpenAI response_format (optional, e.g. JSON mode)
+            out_path: Stream the response into this file as it arrives (optional)
+            task: Output type, for its token cap (see _completion_options)
+            model: Model to call instead of self.model (optional)
             
         Returns:
             LLM response text
         """
-        messages = []
+        if out_path:
+            return self._call_llm_stream(prompt, system_prompt, out_path, task, model)
         
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        key, embedding, cached = self._lookup(prompt, system_prompt, model)
+        if cached is not None:
+            return cached
         
-        messages.append({"role": "user", "content": prompt})
+        messages = self._build_messages(prompt, system_prompt, model)
+        extra = {'response_format': response_format} if response_format else {}
         
-        if self.verbose:
-            tokens = estimate_tokens(prompt)
-            print_info(f"Calling {self.model} (~{tokens} input tokens)...")
+        try:
+            response = self._create_completion(task, model, messages=messages, **extra)
+            
+            # Track usage
+            self._record_usage(response.usage.prompt_tokens, response.usage.completion_tokens, model)
+            
+            text = response.choices[0].message.content
+            self._cache_store(key, embedding, prompt, text, model)
+            
+            return text
+            
+        except Exception as e:
+            print_error(f"API call failed: {e}")
+            raise
+    
+    def _call_llm_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        out_path: str = None,
+        task: str = None,
+        model: str = None
+    ) -> str:
+        """
+        Call the LLM with streaming, writing tokens to a file as they arrive
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            out_path: File to write the response into (optional)
+            task: Output type, for its token cap (see _completion_options)
+            model: Model to call instead of self.model (optional)
+            
+        Returns:
+            Full LLM response text
+        """
+        return "".join(self._iter_llm_stream(prompt, system_prompt, out_path, task, model))
+    
+    def _iter_llm_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        out_path: str = None,
+        task: str = None,
+        model: str = None
+    ) -> Iterator[str]:
+        """
+        Call the LLM with streaming, yielding tokens as they arrive
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            out_path: File to also write the response into (optional)
+            task: Output type, for its token cap (see _completion_options)
+            model: Model to call instead of self.model (optional)
+            
+        Yields:
+            Pieces of the response text (a cached response comes in one piece)
+        """
+        out = open_output_file(out_path) if out_path else None
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            key, embedding, cached = self._lookup(prompt, system_prompt, model)
+            if cached is not None:
+                if out:
+                    out.write(cached)
+                yield cached
+                return
+            
+            messages = self._build_messages(prompt, system_prompt, model)
+            
+            stream = self._create_completion(
+                task,
+                model,
                 messages=messages,
-                temperature=Config.TEMPERATURE,
-                max_tokens=Config.MAX_OUTPUT_TOKENS
+                stream=True,
+                stream_options={"include_usage": True}
             )
             
-            # Track usage
-            usage = response.usage
-            self.total_input_tokens += usage.prompt_tokens
-            self.total_output_tokens += usage.completion_tokens
-            self.api_calls += 1
+            parts = []
+            for chunk in stream:
+                # The final chunk carries the usage and no choices
+                if chunk.usage:
+                    self._record_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens, model)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    parts.append(delta)
+                    if out:
+                        out.write(delta)
+                        out.flush()
+                    yield delta
             
-            return response.choices[0].message.content
+            self._cache_store(key, embedding, prompt, "".join(parts), model)
             
         except Exception as e:
             print_error(f"API call failed: {e}")
+            if out:
+                out.close()
+                os.remove(out_path)
             raise
+        
+        finally:
+            if out:
+                out.close()
     
-    def summarize_meeting(self, notes: str, date: str = None) -> str:
+    async def _acall_llm(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        response_format: dict = None,
+        out_path: str = None,
+        task: str = None,
+        model: str = None
+    ) -> str:
         """
-        Generate meeting summary from notes
+        Call the LLM with a prompt without blocking the event loop
         
         Args:
-            notes: Raw meeting notes
-            date: Meeting date (optional, defaults to today)
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            response_format: OpenAI response_format (optional, e.g. JSON mode)
+            out_path: Stream the response into this file as it arrives (optional)
+            task: Output type, for its token cap (see _completion_options)
+            model: Model to call instead of self.model (optional)
             
         Returns:
-            Formatted meeting summary
+            LLM response text
         """
+        if out_path:
+            return await self._acall_llm_stream(prompt, system_prompt, out_path, task, model)
+        
+        key, embedding, cached = await self._alookup(prompt, system_prompt, model)
+        if cached is not None:
+            return cached
+        
+        messages = self._build_messages(prompt, system_prompt, model)
+        extra = {'response_format': response_format} if response_format else {}
+        
+        try:
+            response = await self._acreate_completion(task, model, messages=messages, **extra)
+            
+            # Track usage
+            self._record_usage(response.usage.prompt_tokens, response.usage.completion_tokens, model)
+            
+            text = response.choices[0].message.content
+            self._cache_store(key, embedding, prompt, text, model)
+            
+            return text
+            
+        except Exception as e:
+            print_error(f"API call failed: {e}")
+            raise
+    
+    async def _acall_llm_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        out_path: str = None,
+        task: str = None,
+        model: str = None
+    ) -> str:
+        """Async version of _call_llm_stream"""
+        out = await aopen_output_file(out_path) if out_path else None
+        
+        try:
+            key, embedding, cached = await self._alookup(prompt, system_prompt, model)
+            if cached is not None:
+                if out:
+                    await out.write(cached)
+                return cached
+            
+            messages = self._build_messages(prompt, system_prompt, model)
+            
+            # The request slot is held until the whole body has been read,
+            # not just until create() returns with the response headers
+            parts = []
+            async with _get_request_semaphore():
+                stream = await self.async_client.chat.completions.create(
+                    model=model or self.model,
+                    **self._completion_options(task),
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                
+                async for chunk in stream:
+                    # The final chunk carries the usage and no choices
+                    if chunk.usage:
+                        self._record_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens, model)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        delta = chunk.choices[0].delta.content
+                        parts.append(delta)
+                        if out:
+                            await out.write(delta)
+                            await out.flush()
+            
+            text = "".join(parts)
+            self._cache_store(key, embedding, prompt, text, model)
+            
+            return text
+            
+        except Exception as e:
+            print_error(f"API call failed: {e}")
+            if out:
+                await out.close()
+                os.remove(out_path)
+            raise
+        
+        finally:
+            if out:
+                await out.close()
+    
+    def _prepare_notes(self, notes: str, date: str = None) -> tuple:
+        """Truncate notes if needed and resolve the meeting date"""
         if self.verbose:
             words = count_words(notes)
             print_info(f"Processing meeting notes ({words} words)...")
         
         # Check and truncate if needed
-        notes, was_truncated = truncate_text(notes, Config.MAX_INPUT_TOKENS)
+        notes, was_truncated = truncate_text(notes, Config.MAX_INPUT_TOKENS, self.encoder)
         if was_truncated and self.verbose:
             print_warning("Input notes were truncated due to length")
         
         # Generate date if not provided
         if date is None:
-            date = datetime.now().strftime("%B %d, %Y")
+            date = format_now("%B %d, %Y")
+        
+        return notes, date
+    
+    def _model_for(self, notes: str) -> str:
+        """
+        Model to summarize these notes with
+        
+        Short notes go to the small model: the prompt bounds the task tightly
+        enough that it does just as well, faster and at a fraction of the cost.
+        """
+        if self.small_model and estimate_tokens(notes, self.encoder) < Config.SMALL_MODEL_MAX_INPUT_TOKENS:
+            return self.small_model
+        return self.model
+    
+    @staticmethod
+    def has_enough_notes(notes: str) -> bool:
+        """
+        Whether notes are long enough to be worth an API call
+        
+        Shorter notes get a canned summary instead. The web UI uses this
+        too, so it applies the same Config.MIN_INPUT_WORDS threshold.
+        
+        Args:
+            notes: Raw meeting notes
+            
+        Returns:
+            True if the notes have at least Config.MIN_INPUT_WORDS words
+        """
+        # Stops after MIN_INPUT_WORDS matches, without copying the rest of the notes
+        words = islice(_WORD_RE.finditer(notes), Config.MIN_INPUT_WORDS)
+        return sum(1 for _ in words) >= Config.MIN_INPUT_WORDS
+    
+    def _insufficient_summary(self, notes: str, date: str = None, out_path: str = None) -> str:
+        """Canned summary for notes too short to summarize (no API call)"""
+        if self.verbose:
+            print_warning("Notes are too short to summarize, skipping the API call")
         
-        # Create prompt
-        prompt = Prompts.format_meeting_summary(notes, date)
+        summary = Prompts.format_insufficient_notes(notes, date)
+        if out_path:
+            write_file(out_path, summary)
+        
+        return summary
+    
+    def _prepare_summary_prompt(self, notes: str, date: str = None) -> str:
+        """Truncate notes if needed and build the summary prompt"""
+        return Prompts.format_meeting_summary(*self._prepare_notes(notes, date))
+    
+    def summarize_meeting(self, notes: str, date: str = None, out_path: str = None) -> str:
+        """
+        Generate meeting summary from notes
+        
+        Args:
+            notes: Raw meeting notes
+            date: Meeting date (optional, defaults to today)
+            out_path: Stream the summary into this file as it is generated (optional)
+            
+        Returns:
+            Formatted meeting summary
+        """
+        if not self.has_enough_notes(notes):
+            return self._insufficient_summary(notes, date, out_path)
+        
+        prompt = self._prepare_summary_prompt(notes, date)
         
         # Call LLM
-        summary = self._call_llm(prompt, Prompts.SYSTEM_PROMPT)
+        summary = self._call_llm(
+            prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='summary', model=self._model_for(notes)
+        )
         
         if self.verbose:
             print_success("Meeting summary generated!")
         
-        return summary
+        return summary
+    
+    def stream_summary(self, notes: str, date: str = None, output_dir: str = None, results: dict = None) -> Iterator[str]:
+        """
+        Generate meeting summary from notes, yielding it as it streams in
+        
+        The summary is saved to a timestamped file as it arrives, e.g. for
+        showing it live in the web UI.
+        
+        Args:
+            notes: Raw meeting notes
+            date: Meeting date (optional, defaults to today)
+            output_dir: Where to save the summary (default from config)
+            results: Dictionary to add 'summary' and 'summary_file' to once done (optional)
+            
+        Yields:
+            Pieces of the summary text
+        """
+        path = self._output_path('summary', output_dir or Config.OUTPUT_DIR)
+        
+        if not self.has_enough_notes(notes):
+            summary = self._insufficient_summary(notes, date, path)
+            yield summary
+            if results is not None:
+                self._add_result(results, 'summary', summary, path)
+                results['skipped'] = True
+            return
+        
+        prompt = self._prepare_summary_prompt(notes, date)
+        
+        parts = []
+        deltas = self._iter_llm_stream(
+            prompt, Prompts.SYSTEM_PROMPT, out_path=path, task='summary', model=self._model_for(notes)
+        )
+        for delta in deltas:
+            parts.append(delta)
+            yield delta
+        
+        if results is not None:
+            self._add_result(results, 'summary', "".join(parts), path)
+    
+    async def asummarize_meeting(self, notes: str, date: str = None, out_path: str = None) -> str:
+        """Async version of summarize_meeting"""
+        if not self.has_enough_notes(notes):
+            return self._insufficient_summary(notes, date, out_path)
+        
+        prompt = self._prepare_summary_prompt(notes, date)
+        
+        summary = await self._acall_llm(
+            prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='summary', model=self._model_for(notes)
+        )
+        
+        if self.verbose:
+            print_success("Meeting summary generated!")
+        
+        return summary
+    
+    async def asummarize_meetings(self, notes_list: list, date: str = None) -> list:
+        """
+        Summarize several meetings concurrently
+        
+        Requests share the event loop's Config.MAX_CONCURRENCY limit and are
+        retried individually on rate limits.
+        
+        Args:
+            notes_list: Raw meeting notes, one string per meeting
+            date: Meeting date used for all of them (default: today)
+            
+        Returns:
+            Summaries in the same order as notes_list
+        """
+        return list(await asyncio.gather(*(self.asummarize_meeting(notes, date) for notes in notes_list)))
+    
+    def summarize_meetings_batch(self, notes_list: list, mode: str = "async", date: str = None):
+        """
+        Summarize several meetings in one go
+        
+        Args:
+            notes_list: Raw meeting notes, one string per meeting
+            mode: "async" to summarize now with concurrent requests, or "batch"
+                to submit an OpenAI Batch API job (half price, done within 24 hours)
+            date: Meeting date used for all of them ("async" mode only)
+            
+        Returns:
+            In "async" mode, the summaries in the same order as notes_list. In
+            "batch" mode, the batch ID; poll_batch saves the summaries
+            (meeting_1, meeting_2, ...) once the job has completed
+        """
+        if mode == "batch":
+            notes_by_name = {f"meeting_{i}": notes for i, notes in enumerate(notes_list, 1)}
+            return self.submit_meetings_batch(notes_by_name, generate_email=False, generate_brief=False)
+        
+        if mode != "async":
+            raise ValueError(f"Unknown batch mode: {mode} (use \"async\" or \"batch\")")
+        
+        return run_async(self.asummarize_meetings(notes_list, date))
+    
+    def generate_email(self, summary: str, out_path: str = None) -> str:
+        """
+        Generate follow-up email from summary
+        
+        Args:
+            summary: Meeting summary
+            out_path: Stream the email into this file as it is generated (optional)
+            
+        Returns:
+            Email draft
+        """
+        if self.verbose:
+            print_info("Generating follow-up email...")
+        
+        prompt = Prompts.format_email_followup(summary)
+        email = self._call_llm(prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='email')
+        
+        if self.verbose:
+            print_success("Follow-up email generated!")
+        
+        return email
+    
+    async def agenerate_email(self, summary: str, out_path: str = None) -> str:
+        """Async version of generate_email"""
+        if self.verbose:
+            print_info("Generating follow-up email...")
+        
+        prompt = Prompts.format_email_followup(summary)
+        email = await self._acall_llm(prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='email')
+        
+        if self.verbose:
+            print_success("Follow-up email generated!")
+        
+        return email
+    
+    def generate_exec_brief(self, summary: str, out_path: str = None) -> str:
+        """
+        Generate executive brief from summary
+        
+        Args:
+            summary: Meeting summary
+            out_path: Stream the brief into this file as it is generated (optional)
+            
+        Returns:
+            Executive brief
+        """
+        if self.verbose:
+            print_info("Generating executive brief...")
+        
+        prompt = Prompts.format_executive_brief(summary)
+        brief = self._call_llm(prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='brief')
+        
+        if self.verbose:
+            print_success("Executive brief generated!")
+        
+        return brief
+    
+    async def agenerate_exec_brief(self, summary: str, out_path: str = None) -> str:
+        """Async version of generate_exec_brief"""
+        if self.verbose:
+            print_info("Generating executive brief...")
+        
+        prompt = Prompts.format_executive_brief(summary)
+        brief = await self._acall_llm(prompt, Prompts.SYSTEM_PROMPT, out_path=out_path, task='brief')
+        
+        if self.verbose:
+            print_success("Executive brief generated!")
+        
+        return brief
+    
+    def notes_as_source(self, notes: str, date: str = None) -> str:
+        """
+        Prepare raw notes for the email/brief prompts in place of a summary
+        
+        For when only the follow-ups are wanted: writing them straight from
+        the notes saves the summary call entirely.
+        
+        Args:
+            notes: Raw meeting notes (truncated if needed)
+            date: Meeting date (optional, defaults to today)
+            
+        Returns:
+            Text to pass as the summary to generate_email, generate_exec_brief
+            or generate_email_and_brief
+        """
+        return Prompts.format_notes_source(*self._prepare_notes(notes, date))
+    
+    def _parse_email_and_brief(self, text: str) -> Optional[tuple]:
+        """Split an email + brief response at its markers, or return None if they are missing"""
+        email_start = text.find(Prompts.EMAIL_MARKER)
+        brief_start = text.find(Prompts.BRIEF_MARKER)
+        
+        if email_start < 0 or brief_start < email_start:
+            if self.verbose:
+                print_warning("Email/brief response was missing its markers, generating them separately")
+            return None
+        
+        email = text[email_start + len(Prompts.EMAIL_MARKER):brief_start].strip()
+        brief = text[brief_start + len(Prompts.BRIEF_MARKER):].strip()
+        
+        if self.verbose:
+            print_success("Follow-up email and executive brief generated!")
+        
+        return email, brief
+    
+    def generate_email_and_brief(self, summary: str) -> Optional[tuple]:
+        """
+        Generate the follow-up email and executive brief in a single API call
+        
+        Both are written from the same summary, so sending it (and the system
+        prompt) once saves a full pass over the shared context.
+        
+        Args:
+            summary: Meeting summary
+            
+        Returns:
+            Tuple of (email, brief), or None if the response couldn't be split
+        """
+        if self.verbose:
+            print_info("Generating follow-up email and executive brief...")
+        
+        prompt = Prompts.format_email_and_brief(summary)
+        text = self._call_llm(prompt, Prompts.SYSTEM_PROMPT, task='email_and_brief')
+        
+        return self._parse_email_and_brief(text)
+    
+    async def agenerate_email_and_brief(self, summary: str) -> Optional[tuple]:
+        """Async version of generate_email_and_brief"""
+        if self.verbose:
+            print_info("Generating follow-up email and executive brief...")
+        
+        prompt = Prompts.format_email_and_brief(summary)
+        text = await self._acall_llm(prompt, Prompts.SYSTEM_PROMPT, task='email_and_brief')
+        
+        return self._parse_email_and_brief(text)
+    
+    def _use_combined_call(self, notes: str, generate_email: bool, generate_brief: bool) -> bool:
+        """
+        Whether the requested outputs should come from one JSON-mode API call
+        
+        Only worth it for short notes: one call saves resending the context,
+        but for long meetings separate calls let the email and brief be
+        generated in parallel.
+        """
+        return (
+            (generate_email or generate_brief)
+            and self._model_for(notes) in Config.JSON_MODE_MODELS
+            and estimate_tokens(notes, self.encoder) < Config.COMBINED_MAX_INPUT_TOKENS
+        )
+    
+    def _parse_combined(self, text: str, keys: list) -> Optional[dict]:
+        """Parse a combined JSON response, or return None if it is malformed"""
+        try:
+            outputs = loads_json(text)
+        except ValueError:
+            outputs = None
+        
+        if not isinstance(outputs, dict) or not all(isinstance(outputs.get(k), str) for k in keys):
+            if self.verbose:
+                print_warning("Combined response was not valid JSON, generating outputs separately")
+            return None
+        
+        if self.verbose:
+            print_success(f"{', '.join(k.capitalize() for k in keys)} generated!")
+        
+        return {k: outputs[k] for k in keys}
+    
+    def generate_all(self, notes: str, date: str = None, want_email: bool = True, want_brief: bool = True) -> Optional[dict]:
+        """
+        Generate the summary plus the email and/or executive brief in a single API call
+        
+        The notes are only sent once, instead of once for the summary and
+        then again (as the summary) for the email and for the brief.
+        
+        Args:
+            notes: Raw meeting notes
+            date: Meeting date (optional, defaults to today)
+            want_email: Whether to include the follow-up email
+            want_brief: Whether to include the executive brief (at least one is required)
+            
+        Returns:
+            Dictionary with 'summary' and the requested 'email'/'brief', or
+            None if the model did not return valid JSON
+        """
+        model = self._model_for(notes)
+        notes, date = self._prepare_notes(notes, date)
+        prompt = Prompts.format_combined(notes, date, want_email, want_brief)
+        text = self._call_llm(prompt, Prompts.SYSTEM_PROMPT, response_format={"type": "json_object"}, model=model)
+        
+        return self._parse_combined(text, self._combined_keys(want_email, want_brief))
+    
+    async def agenerate_all(self, notes: str, date: str = None, want_email: bool = True, want_brief: bool = True) -> Optional[dict]:
+        """Async version of generate_all"""
+        model = self._model_for(notes)
+        notes, date = self._prepare_notes(notes, date)
+        prompt = Prompts.format_combined(notes, date, want_email, want_brief)
+        text = await self._acall_llm(prompt, Prompts.SYSTEM_PROMPT, response_format={"type": "json_object"}, model=model)
+        
+        return self._parse_combined(text, self._combined_keys(want_email, want_brief))
+    
+    @staticmethod
+    def _combined_keys(want_email: bool, want_brief: bool) -> list:
+        """Output keys a combined call returns"""
+        return [key for key, wanted in (('summary', True), ('email', want_email), ('brief', want_brief)) if wanted]
+    
+    def _batch_request(self, custom_id: str, prompt: str) -> dict:
+        """Build one Batch API request line for a prompt (custom_id is "<output>:<name>")"""
+        task = custom_id.split(":", 1)[0]
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": self._build_messages(prompt, Prompts.SYSTEM_PROMPT),
+                **self._completion_options(task)
+            }
+        }
+    
+    def submit_batch(self, requests: list, metadata: dict = None) -> str:
+        """
+        Upload requests to the OpenAI Batch API and start a batch job
+        
+        Batch jobs are billed at 50% of the regular price and complete
+        within 24 hours.
+        
+        Args:
+            requests: Request lines built with _batch_request
+            metadata: String key/value pairs stored on the batch
+            
+        Returns:
+            Batch ID
+        """
+        data = dumps_jsonl(requests)
+        batch_file = self.client.files.create(
+            file=("meeting_batch.jsonl", data),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata=metadata
+        )
+        return batch.id
     
-    def generate_email(self, summary: str) -> str:
+    def submit_meetings_batch(
+        self,
+        notes_by_name: dict,
+        output_dir: str = None,
+        generate_email: bool = None,
+        generate_brief: bool = None
+    ) -> str:
         """
-        Generate follow-up email from summary
+        Submit the summaries for several meetings as one Batch API job
+        
+        Emails and briefs depend on the summaries, so poll_batch submits
+        them as a follow-up batch once this one has completed.
         
         Args:
-            summary: Meeting summary
+            notes_by_name: Raw meeting notes keyed by a unique name (e.g. file name)
+            output_dir: Where poll_batch should save outputs (default from config)
+            generate_email: Whether to generate emails (default from config)
+            generate_brief: Whether to generate briefs (default from config)
             
         Returns:
-            Email draft
+            Batch ID
         """
-        if self.verbose:
-            print_info("Generating follow-up email...")
-        
-        prompt = Prompts.format_email_followup(summary)
-        email = self._call_llm(prompt, Prompts.SYSTEM_PROMPT)
+        generate_email = generate_email if generate_email is not None else Config.GENERATE_EMAIL
+        generate_brief = generate_brief if generate_brief is not None else Config.GENERATE_EXEC_BRIEF
         
-        if self.verbose:
-            print_success("Follow-up email generated!")
+        requests = [
+            self._batch_request(f"summary:{name}", self._prepare_summary_prompt(notes))
+            for name, notes in notes_by_name.items()
+        ]
         
-        return email
+        # Everything poll_batch needs later travels with the batch itself
+        metadata = {
+            'stage': 'summary',
+            'model': self.model,
+            'output_dir': output_dir or Config.OUTPUT_DIR,
+            'generate_email': str(int(generate_email)),
+            'generate_brief': str(int(generate_brief))
+        }
+        return self.submit_batch(requests, metadata)
     
-    def generate_exec_brief(self, summary: str) -> str:
+    def fetch_batch_results(self, batch_id: str) -> tuple:
         """
-        Generate executive brief from summary
+        Download the results of a finished batch job
         
         Args:
-            summary: Meeting summary
+            batch_id: Batch ID returned by submit_batch
             
         Returns:
-            Executive brief
+            Tuple of (batch, {custom_id: response text}); the dict is None
+            while the batch is still running
         """
-        if self.verbose:
-            print_info("Generating executive brief...")
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return batch, None
         
-        prompt = Prompts.format_executive_brief(summary)
-        brief = self._call_llm(prompt, Prompts.SYSTEM_PROMPT)
+        outputs = {}
+        if not batch.output_file_id:
+            return batch, outputs
         
-        if self.verbose:
-            print_success("Executive brief generated!")
+        # Priced as the model the batch was submitted with: the response
+        # bodies name a dated snapshot that the pricing table doesn't list
+        model = (batch.metadata or {}).get("model") or self.model
         
-        return brief
+        content = self.client.files.content(batch.output_file_id).content
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            
+            record = loads_json(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                print_error(f"Batch request {record['custom_id']} failed: {record.get('error') or response.get('body')}")
+                continue
+            
+            body = response["body"]
+            self._record_usage(body["usage"]["prompt_tokens"], body["usage"]["completion_tokens"], model)
+            outputs[record["custom_id"]] = body["choices"][0]["message"]["content"]
+        
+        return batch, outputs
     
     def get_cost_summary(self) -> dict:
         """Get cost summary for this session"""
-        model_pricing = self.pricing.get(self.model, {'input': 0, 'output': 0})
+        with self._usage_lock:
+            tokens_by_model = {model: tuple(tokens) for model, tokens in self.tokens_by_model.items()}
         
-        input_cost = (self.total_input_tokens / 1000) * model_pricing['input']
-        output_cost = (self.total_output_tokens / 1000) * model_pricing['output']
+        # Priced per model, since short notes may have gone to the small model
+        input_cost = output_cost = 0.0
+        for model, (input_tokens, output_tokens) in tokens_by_model.items():
+            model_pricing = self.pricing.get(model, {'input': 0, 'output': 0})
+            input_cost += (input_tokens / 1000) * model_pricing['input']
+            output_cost += (output_tokens / 1000) * model_pricing['output']
         total_cost = input_cost + output_cost
         
         return {
             'api_calls': self.api_calls,
+            'cache_hits': self.cache_hits,
             'input_tokens': self.total_input_tokens,
             'output_tokens': self.total_output_tokens,
             'total_tokens': self.total_input_tokens + self.total_output_tokens,
             'input_cost': input_cost,
             'output_cost': output_cost,
             'total_cost': total_cost,
-            'model': self.model
+            'model': self.model,
+            'models': list(tokens_by_model) or [self.model]
         }
     
     def print_cost_summary(self):
@@ -206,12 +1305,130 @@ class MeetingSummarizer:
         print(format_output_separator())
         print("💰 COST SUMMARY")
         print(format_output_separator())
-        print(f"Model:        {summary['model']}")
+        print(f"Model:        {', '.join(summary['models'])}")
         print(f"API Calls:    {summary['api_calls']}")
+        if summary['cache_hits']:
+            print(f"Cache Hits:   {summary['cache_hits']}")
         print(f"Tokens:       {summary['total_tokens']:,} ({summary['input_tokens']:,} in + {summary['output_tokens']:,} out)")
         print(f"Cost:         ${summary['total_cost']:.4f}")
         print(format_output_separator())
     
+    def _output_path(self, key: str, output_dir: str) -> str:
+        """
+        Pick a timestamped path for an output and reserve it
+        
+        The file is created empty right away so that concurrent tasks never
+        end up with the same name.
+        """
+        base_name, extension = OUTPUT_FILES[key]
+        os.makedirs(output_dir, exist_ok=True)
+        
+        while True:
+            path = generate_filename(base_name, extension, output_dir)
+            try:
+                RecentIndex.reserve(path)
+                return path
+            except FileExistsError:
+                continue
+    
+    def _add_result(self, results: dict, key: str, content: str, path: str):
+        """Store an output and its file path in results"""
+        results[key] = content
+        results[f'{key}_file'] = path
+        RecentIndex.push(path)  # Written by now, so the index sees its final mtime
+        
+        if self.verbose:
+            print_success(f"{key.capitalize()} saved: {path}")
+    
+    def _save_output(self, results: dict, key: str, content: str, output_dir: str):
+        """Write an output to a timestamped file and store it in results"""
+        path = self._output_path(key, output_dir)
+        write_file(path, content)
+        self._add_result(results, key, content, path)
+    
+    def _save_outputs(self, results: dict, outputs: dict, output_dir: str):
+        """Write several outputs with a single directory sync and store them in results"""
+        paths = {key: self._output_path(key, output_dir) for key in outputs}
+        write_all([(paths[key], content) for key, content in outputs.items()], output_dir)
+        
+        for key, content in outputs.items():
+            self._add_result(results, key, content, paths[key])
+    
+    async def _asave_outputs(self, results: dict, outputs: dict, output_dir: str):
+        """Async version of _save_outputs (the writes run in a worker thread)"""
+        await asyncio.to_thread(self._save_outputs, results, outputs, output_dir)
+    
+    async def _asave_output(self, results: dict, key: str, content: str, output_dir: str):
+        """Async version of _save_output"""
+        path = self._output_path(key, output_dir)
+        await awrite_file(path, content)
+        self._add_result(results, key, content, path)
+    
+    async def agenerate_followups(
+        self,
+        results: dict,
+        generate_email: bool = None,
+        generate_brief: bool = None,
+        output_dir: str = None
+    ):
+        """
+        Generate the email and/or executive brief for a summary
+        
+        When both are wanted they come from a single call; otherwise (or if
+        that response can't be split) they are generated in parallel.
+        
+        Args:
+            results: Results holding the 'summary'; the outputs and their
+                file paths are added to it
+            generate_email: Whether to generate email (default from config)
+            generate_brief: Whether to generate brief (default from config)
+            output_dir: Where to save outputs (default from config)
+        """
+        generate_email = generate_email if generate_email is not None else Config.GENERATE_EMAIL
+        generate_brief = generate_brief if generate_brief is not None else Config.GENERATE_EXEC_BRIEF
+        output_dir = output_dir or Config.OUTPUT_DIR
+        summary = results['summary']
+        
+        # No follow-ups for a canned "too short" summary
+        if results.get('skipped'):
+            return
+        
+        # Both from one call when possible (the summary is only sent once)
+        if generate_email and generate_brief:
+            outputs = await self.agenerate_email_and_brief(summary)
+            if outputs:
+                await self._asave_outputs(results, dict(zip(('email', 'brief'), outputs)), output_dir)
+                return
+        
+        email_path = self._output_path('email', output_dir) if generate_email else None
+        brief_path = self._output_path('brief', output_dir) if generate_brief else None
+        
+        email, brief = await asyncio.gather(
+            self.agenerate_email(summary, out_path=email_path) if generate_email else _noop(),
+            self.agenerate_exec_brief(summary, out_path=brief_path) if generate_brief else _noop()
+        )
+        
+        if generate_email:
+            self._add_result(results, 'email', email, email_path)
+        
+        if generate_brief:
+            self._add_result(results, 'brief', brief, brief_path)
+    
+    def _print_start(self):
+        """Print the processing banner"""
+        if self.verbose:
+            print(format_output_separator())
+            print("🚀 MEETING SUMMARIZER - Starting Processing")
+            print(format_output_separator())
+    
+    def _print_finish(self):
+        """Print the cost summary and completion banner"""
+        if self.verbose:
+            self.print_cost_summary()
+            print(format_output_separator())
+            print("✅ PROCESSING COMPLETE!")
+            print(format_output_separator())
+    
     def process_meeting(
         self,
         notes: str,
@@ -231,12 +1448,10 @@ class MeetingSummarizer:
             output_dir: Where to save outputs (default from config)
             
         Returns:
-            Dictionary with all outputs and file paths
+            Dictionary with all outputs and file paths ('skipped' is set
+            when the notes were too short to summarize)
         """
-        if self.verbose:
-            print(format_output_separator())
-            print("🚀 MEETING SUMMARIZER - Starting Processing")
-            print(format_output_separator())
+        self._print_start()
         
         # Use config defaults if not specified
         generate_email = generate_email if generate_email is not None else Config.GENERATE_EMAIL
@@ -245,52 +1460,110 @@ class MeetingSummarizer:
         
         results = {}
         
-        # Step 1: Generate meeting summary
-        summary = self.summarize_meeting(notes, date)
-        results['summary'] = summary
+        # Notes too short to summarize: canned summary, no API calls
+        if not self.has_enough_notes(notes):
+            summary_path = self._output_path('summary', output_dir)
+            self._add_result(results, 'summary', self._insufficient_summary(notes, date, summary_path), summary_path)
+            results['skipped'] = True
+            self._print_finish()
+            return results
         
-        # Save summary
-        summary_path = generate_filename("meeting_summary", "md", output_dir)
-        write_file(summary_path, summary)
-        results['summary_file'] = summary_path
+        # Fast path for short notes: everything from a single API call
+        if self._use_combined_call(notes, generate_email, generate_brief):
+            outputs = self.generate_all(notes, date, generate_email, generate_brief)
+            if outputs:
+                self._save_outputs(results, outputs, output_dir)
+                self._print_finish()
+                return results
         
-        if self.verbose:
-            print_success(f"Summary saved: {summary_path}")
+        # Step 1: Generate meeting summary (streamed straight to its file)
+        summary_path = self._output_path('summary', output_dir)
+        summary = self.summarize_meeting(notes, date, out_path=summary_path)
+        self._add_result(results, 'summary', summary, summary_path)
+        
+        # Both follow-ups from one call when possible
+        if generate_email and generate_brief:
+            outputs = self.generate_email_and_brief(summary)
+            if outputs:
+                self._save_outputs(results, dict(zip(('email', 'brief'), outputs)), output_dir)
+                self._print_finish()
+                return results
         
         # Step 2: Generate email (if requested)
         if generate_email:
-            email = self.generate_email(summary)
-            results['email'] = email
-            
-            # Save email
-            email_path = generate_filename("meeting_followup_email", "txt", output_dir)
-            write_file(email_path, email)
-            results['email_file'] = email_path
-            
-            if self.verbose:
-                print_success(f"Email saved: {email_path}")
+            email_path = self._output_path('email', output_dir)
+            email = self.generate_email(summary, out_path=email_path)
+            self._add_result(results, 'email', email, email_path)
         
         # Step 3: Generate executive brief (if requested)
         if generate_brief:
-            brief = self.generate_exec_brief(summary)
-            results['brief'] = brief
-            
-            # Save brief
-            brief_path = generate_filename("executive_brief", "txt", output_dir)
-            write_file(brief_path, brief)
-            results['brief_file'] = brief_path
+            brief_path = self._output_path('brief', output_dir)
+            brief = self.generate_exec_brief(summary, out_path=brief_path)
+            self._add_result(results, 'brief', brief, brief_path)
+        
+        self._print_finish()
+        
+        return results
+    
+    async def aprocess_meeting(
+        self,
+        notes: str,
+        date: str = None,
+        generate_email: bool = None,
+        generate_brief: bool = None,
+        output_dir: str = None
+    ) -> dict:
+        """
+        Async version of process_meeting
+        
+        The email and executive brief only depend on the summary, so once
+        it is ready both are generated concurrently.
+        
+        Args:
+            notes: Raw meeting notes
+            date: Meeting date (optional)
+            generate_email: Whether to generate email (default from config)
+            generate_brief: Whether to generate brief (default from config)
+            output_dir: Where to save outputs (default from config)
             
-            if self.verbose:
-                print_success(f"Brief saved: {brief_path}")
+        Returns:
+            Dictionary with all outputs and file paths ('skipped' is set
+            when the notes were too short to summarize)
+        """
+        self._print_start()
         
-        # Print cost summary
-        if self.verbose:
-            self.print_cost_summary()
+        # Use config defaults if not specified
+        generate_email = generate_email if generate_email is not None else Config.GENERATE_EMAIL
+        generate_brief = generate_brief if generate_brief is not None else Config.GENERATE_EXEC_BRIEF
+        output_dir = output_dir or Config.OUTPUT_DIR
         
-        if self.verbose:
-            print(format_output_separator())
-            print("✅ PROCESSING COMPLETE!")
-            print(format_output_separator())
+        results = {}
+        
+        # Notes too short to summarize: canned summary, no API calls
+        if not self.has_enough_notes(notes):
+            summary_path = self._output_path('summary', output_dir)
+            self._add_result(results, 'summary', self._insufficient_summary(notes, date, summary_path), summary_path)
+            results['skipped'] = True
+            self._print_finish()
+            return results
+        
+        # Fast path for short notes: everything from a single API call
+        if self._use_combined_call(notes, generate_email, generate_brief):
+            outputs = await self.agenerate_all(notes, date, generate_email, generate_brief)
+            if outputs:
+                await self._asave_outputs(results, outputs, output_dir)
+                self._print_finish()
+                return results
+        
+        # Step 1: Generate meeting summary (streamed straight to its file)
+        summary_path = self._output_path('summary', output_dir)
+        summary = await self.asummarize_meeting(notes, date, out_path=summary_path)
+        self._add_result(results, 'summary', summary, summary_path)
+        
+        # Step 2: Generate email and executive brief in parallel (if requested)
+        await self.agenerate_followups(results, generate_email, generate_brief, output_dir)
+        
+        self._print_finish()
         
         return results
 
@@ -304,21 +1577,14 @@ def interactive_mode():
     print("Enter your meeting notes (press Ctrl+D when done, Ctrl+C to cancel):")
     print(format_output_separator())
     
-    # Read multi-line input
-    lines = []
+    # Read multi-line input in one go (up to EOF)
     try:
-        while True:
-            line = input()
-            lines.append(line)
-    except EOFError:
-        pass
+        notes = sys.stdin.read()
     except KeyboardInterrupt:
         print("\n")
         print_warning("Cancelled")
         return
     
-    notes = '\n'.join(lines)
-    
     if not notes.strip():
         print_error("No notes entered!")
         return
@@ -344,20 +1610,31 @@ def interactive_mode():
     model_choice = input("\nChoice (1-2, default 1): ").strip() or '1'
     model = "gpt-4" if model_choice == '2' else "gpt-3.5-turbo"
     
-    # Process
+    # Process: the summary is printed as it streams in, then the follow-ups
+    # are written from it
     summarizer = MeetingSummarizer(model=model)
-    results = summarizer.process_meeting(
-        notes=notes,
-        generate_email=generate_email,
-        generate_brief=generate_brief
-    )
+    results = {}
     
-    # Display results
     print(format_output_separator())
     print("📄 SUMMARY:")
     print(format_output_separator())
-    print(results['summary'])
     
+    try:
+        for delta in summarizer.stream_summary(notes, results=results):
+            print(delta, end="", flush=True)
+        print()
+    except BaseException:
+        summarizer.close()
+        raise
+    
+    asyncio.run(_closing(summarizer, summarizer.agenerate_followups(
+        results,
+        generate_email=generate_email,
+        generate_brief=generate_brief
+    )))
+    summarizer.print_cost_summary()
+    
+    # Display results
     if 'email' in results:
         print(format_output_separator())
         print("📧 EMAIL:")
@@ -368,50 +1645,120 @@ def interactive_mode():
     print_success("Done! Files saved to output/")
 
 
-def batch_process(input_dir: str, output_dir: str = None, model: str = None):
+async def abatch_process(input_dir: str, output_dir: str = None, model: str = None, concurrency: int = None):
     """
-    Process multiple meeting notes files
+    Process multiple meeting notes files concurrently
     
     Args:
         input_dir: Directory containing meeting notes files
         output_dir: Where to save outputs
         model: AI model to use
+        concurrency: Maximum number of files processed at once (default from config)
     """
-    import glob
-    
     output_dir = output_dir or Config.OUTPUT_DIR
+    concurrency = concurrency or Config.MAX_CONCURRENCY
     
-    # Find all text files
-    pattern = os.path.join(input_dir, "*.txt")
-    files = glob.glob(pattern)
+    # Find all text files (the paths are kept to schedule longest-first)
+    files = list(iter_text_files(input_dir))
     
     if not files:
         print_error(f"No .txt files found in {input_dir}")
         return
     
-    print_info(f"Found {len(files)} files to process")
+    print_info(f"Found {len(files)} files to process (up to {concurrency} at a time)")
     print(format_output_separator())
     
+    # One summarizer (and one client connection pool) shared by all tasks
     summarizer = MeetingSummarizer(model=model, verbose=False)
+    semaphore = asyncio.Semaphore(concurrency)
     
     results = []
-    for i, filepath in enumerate(files, 1):
+    done = 0
+    
+    def _report(filename: str, result: Optional[dict], error: Optional[Exception]):
+        nonlocal done
+        done += 1
+        if error is None:
+            results.append(result)
+            print_success(f"[{done}/{len(files)}] {filename}: {result['summary_file']}")
+        else:
+            print_error(f"[{done}/{len(files)}] {filename} failed: {error}")
+    
+    # Read everything up front (concurrently) and tokenize it in one batch
+    contents = await asyncio.gather(*(aread_file(f) for f in files), return_exceptions=True)
+    
+    notes_by_file = {}
+    for filepath, content in zip(files, contents):
+        if isinstance(content, Exception):
+            _report(os.path.basename(filepath), None, content)
+        else:
+            notes_by_file[filepath] = content
+    
+    # Identical notes are only sent once; their copies reuse the outputs
+    digests = {
+        filepath: hashlib.blake2b(notes.encode('utf-8'), digest_size=16).hexdigest()
+        for filepath, notes in notes_by_file.items()
+    }
+    originals = {}
+    for filepath, digest in digests.items():
+        originals.setdefault(digest, filepath)
+    
+    unique_files = list(originals.values())
+    token_counts = count_tokens_batch([notes_by_file[f] for f in unique_files], summarizer.encoder)
+    
+    for filepath, tokens in zip(unique_files, token_counts):
+        if tokens > Config.MAX_INPUT_TOKENS:
+            print_warning(f"{os.path.basename(filepath)} has ~{tokens:,} tokens and will be truncated")
+    
+    # Longest meetings first, so a big file doesn't start last and hold up the run
+    schedule = sorted(zip(unique_files, token_counts), key=lambda item: item[1], reverse=True)
+    
+    async def _process_one(filepath: str):
+        filename = os.path.basename(filepath)
+        async with semaphore:
+            try:
+                result = await summarizer.aprocess_meeting(
+                    notes=notes_by_file[filepath],
+                    output_dir=output_dir
+                )
+                result['source_file'] = filename
+                return filename, result, None
+            except Exception as e:
+                return filename, None, e
+    
+    async def _copy_one(filepath: str, original: asyncio.Task):
         filename = os.path.basename(filepath)
-        print(f"[{i}/{len(files)}] Processing {filename}...")
+        _, source, error = await original
+        if error is not None:
+            return filename, None, error
         
         try:
-            notes = read_file(filepath)
-            result = summarizer.process_meeting(
-                notes=notes,
-                output_dir=output_dir
-            )
+            result = {}
+            for key in OUTPUT_FILES:
+                if key in source:
+                    await summarizer._asave_output(result, key, source[key], output_dir)
             result['source_file'] = filename
-            results.append(result)
-            print_success(f"  Done: {result['summary_file']}")
-            
+            return filename, result, None
         except Exception as e:
-            print_error(f"  Failed: {e}")
-            continue
+            return filename, None, e
+    
+    # Create the tasks in schedule order (as_completed would start them in arbitrary order)
+    tasks_by_digest = {
+        digests[filepath]: asyncio.create_task(_process_one(filepath))
+        for filepath, _ in schedule
+    }
+    tasks = list(tasks_by_digest.values())
+    
+    duplicates = [f for f, digest in digests.items() if originals[digest] != f]
+    if duplicates:
+        print_info(f"{len(duplicates)} duplicate file(s) will reuse existing outputs")
+    tasks += [asyncio.create_task(_copy_one(f, tasks_by_digest[digests[f]])) for f in duplicates]
+    
+    try:
+        for task in asyncio.as_completed(tasks):
+            _report(*(await task))
+    finally:
+        await summarizer.aclose()
     
     print(format_output_separator())
     print_success(f"Processed {len(results)}/{len(files)} files")
@@ -422,9 +1769,123 @@ def batch_process(input_dir: str, output_dir: str = None, model: str = None):
     return results
 
 
-def main():
+def batch_process(input_dir: str, output_dir: str = None, model: str = None, concurrency: int = None):
     """
-    Command-line interface for Meeting Summarizer
+    Process multiple meeting notes files
+    
+    Args:
+        input_dir: Directory containing meeting notes files
+        output_dir: Where to save outputs
+        model: AI model to use
+        concurrency: Maximum number of files processed at once (default from config)
+    """
+    return asyncio.run(abatch_process(input_dir, output_dir, model, concurrency))
+
+
+def batch_process_offline(input_dir: str, output_dir: str = None, model: str = None) -> Optional[str]:
+    """
+    Submit all meeting notes files in a directory as one OpenAI Batch API job
+    
+    Costs half as much as batch_process but results arrive asynchronously
+    (within 24h). Use poll_batch to collect them.
+    
+    Args:
+        input_dir: Directory containing meeting notes files
+        output_dir: Where to save outputs
+        model: AI model to use
+        
+    Returns:
+        Batch ID, or None if there was nothing to submit
+    """
+    output_dir = output_dir or Config.OUTPUT_DIR
+    
+    # Find all text files
+    files = list(iter_text_files(input_dir))
+    
+    if not files:
+        print_error(f"No .txt files found in {input_dir}")
+        return None
+    
+    notes_by_name = {os.path.basename(filepath): read_file(filepath) for filepath in files}
+    
+    with MeetingSummarizer(model=model, verbose=False) as summarizer:
+        batch_id = summarizer.submit_meetings_batch(notes_by_name, output_dir)
+    
+    print_success(f"Submitted batch {batch_id} with {len(notes_by_name)} files")
+    print_info(f"Check on it with: python agent.py --poll {batch_id}")
+    
+    return batch_id
+
+
+def poll_batch(batch_id: str, output_dir: str = None) -> tuple:
+    """
+    Check a Batch API job and save its outputs once it has completed
+    
+    Finished summary batches automatically submit a follow-up batch for the
+    emails/briefs, which can be polled the same way.
+    
+    Args:
+        batch_id: Batch ID returned by batch_process_offline
+        output_dir: Where to save outputs (default: the one used at submission)
+        
+    Returns:
+        Tuple of (results per source file, or None if still running;
+        follow-up batch ID, or None if there is nothing left to do)
+    """
+    with MeetingSummarizer(verbose=False) as summarizer:
+        return _poll_batch(summarizer, batch_id, output_dir)
+
+
+def _poll_batch(summarizer: MeetingSummarizer, batch_id: str, output_dir: str = None) -> tuple:
+    """Implementation of poll_batch using an open summarizer"""
+    batch, outputs = summarizer.fetch_batch_results(batch_id)
+    
+    if outputs is None:
+        counts = batch.request_counts
+        print_info(f"Batch {batch_id} is {batch.status} ({counts.completed}/{counts.total} requests done)")
+        return None, None
+    
+    metadata = batch.metadata or {}
+    summarizer.model = metadata.get('model', summarizer.model)
+    output_dir = output_dir or metadata.get('output_dir') or Config.OUTPUT_DIR
+    
+    results = {}
+    followups = []
+    for custom_id, content in outputs.items():
+        key, filename = custom_id.split(":", 1)
+        result = results.setdefault(filename, {'source_file': filename})
+        summarizer._save_output(result, key, content, output_dir)
+        
+        if key == 'summary':
+            if metadata.get('generate_email') == '1':
+                prompt = Prompts.format_email_followup(content)
+                followups.append(summarizer._batch_request(f"email:{filename}", prompt))
+            if metadata.get('generate_brief') == '1':
+                prompt = Prompts.format_executive_brief(content)
+                followups.append(summarizer._batch_request(f"brief:{filename}", prompt))
+    
+    print_success(f"Saved outputs for {len(results)} files to {output_dir}")
+    
+    followup_id = None
+    if followups:
+        followup_metadata = {'stage': 'followup', 'model': summarizer.model, 'output_dir': output_dir}
+        followup_id = summarizer.submit_batch(followups, followup_metadata)
+        print_success(f"Submitted follow-up batch {followup_id} for {len(followups)} emails/briefs")
+        print_info(f"Check on it with: python agent.py --poll {followup_id}")
+    
+    summarizer.print_cost_summary()
+    print_info("Batch API requests are billed at 50% of the cost shown")
+    
+    return results, followup_id
+
+
+@lru_cache(maxsize=None)
+def build_parser():
+    """
+    Build the command-line argument parser (once per process)
+    
+    Returns:
+        Configured argparse.ArgumentParser
     """
     import argparse
     
@@ -445,9 +1906,16 @@ Examples:
   # Batch process directory:
   python agent.py --batch ./meetings/
   
+  # Batch process via the Batch API (50% cheaper, results within 24h):
+  python agent.py --batch ./meetings/ --offline
+  python agent.py --poll BATCH_ID
+  
   # Use GPT-4 (higher quality):
   python agent.py --input notes.txt --model gpt-4
   
+  # Summarize short notes with a cheaper model:
+  python agent.py --input notes.txt --small-model
+  
   # Generate email only (no brief):
   python agent.py --input notes.txt --email --no-brief
   
@@ -477,6 +1945,19 @@ Examples:
         help='Batch process all .txt files in directory'
     )
     
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='With --batch: submit via the OpenAI Batch API (50%% cheaper, results within 24h)'
+    )
+    
+    parser.add_argument(
+        '--poll',
+        type=str,
+        metavar='BATCH_ID',
+        help='Check an offline batch and save its results when complete'
+    )
+    
     # Input options
     input_group = parser.add_mutually_exclusive_group(required=False)
     input_group.add_argument(
@@ -506,6 +1987,16 @@ Examples:
         default=Config.DEFAULT_MODEL
     )
     
+    parser.add_argument(
+        '--small-model',
+        type=str,
+        nargs='?',
+        const=Config.SMALL_MODEL_CHOICE,
+        metavar='MODEL',
+        help=f'Summarize notes under {Config.SMALL_MODEL_MAX_INPUT_TOKENS} tokens with a cheaper model (default when given: {Config.SMALL_MODEL_CHOICE})',
+        default=Config.SMALL_MODEL
+    )
+    
     parser.add_argument(
         '--output', '-o',
         type=str,
@@ -537,22 +2028,57 @@ Examples:
         help='Skip brief generation'
     )
     
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        help=f'Files processed in parallel in batch mode (default: {Config.MAX_CONCURRENCY})',
+        default=Config.MAX_CONCURRENCY
+    )
+    
+    parser.add_argument(
+        '--cache',
+        type=str,
+        choices=Config.CACHE_MODES,
+        help=f'Response cache: off, exact (identical notes) or semantic (also near-identical notes) (default: {Config.CACHE_MODE})',
+        default=Config.CACHE_MODE
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
         help='Quiet mode (minimal output)'
     )
     
+    return parser
+
+
+def main():
+    """
+    Command-line interface for Meeting Summarizer
+    """
+    parser = build_parser()
     args = parser.parse_args()
     
+    Config.CACHE_MODE = args.cache
+    Config.SMALL_MODEL = args.small_model
+    
     # Check if interactive mode
     if args.interactive:
         interactive_mode()
         sys.exit(0)
     
+    # Check if polling an offline batch
+    if args.poll:
+        poll_batch(args.poll, args.output)
+        sys.exit(0)
+    
     # Check if batch mode
+    if args.batch and args.offline:
+        batch_process_offline(args.batch, args.output, args.model)
+        sys.exit(0)
+    
     if args.batch:
-        batch_process(args.batch, args.output, args.model)
+        asyncio.run(abatch_process(args.batch, args.output, args.model, args.concurrency))
         sys.exit(0)
     
     # If not interactive or batch, require input
@@ -583,13 +2109,13 @@ Examples:
         )
         
         # Process meeting
-        results = summarizer.process_meeting(
+        results = asyncio.run(_closing(summarizer, summarizer.aprocess_meeting(
             notes=notes,
             date=args.date,
             generate_email=generate_email,
             generate_brief=generate_brief,
             output_dir=args.output
-        )
+        )))
         
         # Print file locations
         if not args.quiet:
@@ -7,21 +7,12 @@ Run with: streamlit run app.py
 
 import streamlit as st
 import os
+import asyncio
 from datetime import datetime
-from agent import MeetingSummarizer
 from config import Config
-import glob
+from utils import count_words, RecentIndex
 
-# Page config
-st.set_page_config(
-    page_title="Meeting Summarizer",
-    page_icon="🤖",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -65,13 +56,88 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page config
+st.set_page_config(
+    page_title="Meeting Summarizer",
+    page_icon="🤖",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS (re-emitted on every rerun: Streamlit only keeps the
+# elements drawn by the current run)
+st.markdown(_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def _agent_module():
+    """Import the agent module on first use, keeping it off the first paint"""
+    import agent
+    return agent
+
+
+@st.cache_resource
+def get_summarizer(model: str, small_model: str = None):
+    """One summarizer (and HTTP connection pool) per model, shared across reruns"""
+    return _agent_module().MeetingSummarizer(model=model, verbose=False, small_model=small_model)
+
+
+async def _process_files(summarizer, files: list, progress_bar, status_text, generate_email: bool, generate_brief: bool) -> list:
+    """
+    Process uploaded meeting notes concurrently, updating progress as each finishes
+    
+    Args:
+        summarizer: Summarizer shared by all files
+        files: (filename, notes) pairs
+        progress_bar: Streamlit progress bar to advance
+        status_text: Streamlit placeholder for the status line
+        generate_email: Whether to generate emails
+        generate_brief: Whether to generate executive briefs
+        
+    Returns:
+        [{'filename': ..., 'result': ...}, ...] for the files that succeeded,
+        in upload order
+    """
+    async def _process_one(index: int, filename: str, notes: str):
+        try:
+            result = await summarizer.aprocess_meeting(
+                notes=notes,
+                generate_email=generate_email,
+                generate_brief=generate_brief
+            )
+            return index, filename, result, None
+        except Exception as e:
+            return index, filename, None, e
+    
+    tasks = [asyncio.create_task(_process_one(i, *file)) for i, file in enumerate(files)]
+    
+    finished = {}
+    for done, task in enumerate(asyncio.as_completed(tasks), 1):
+        index, filename, result, error = await task
+        if error is None:
+            finished[index] = {'filename': filename, 'result': result}
+        else:
+            st.warning(f"⚠️ Failed to process {filename}: {str(error)}")
+        
+        progress_bar.progress(done / len(tasks))
+        status_text.text(f"Processed {done}/{len(tasks)} files...")
+    
+    return [finished[index] for index in sorted(finished)]
+
+
+def api_key_configured() -> bool:
+    """Whether a real OpenAI API key is set"""
+    return bool(Config.OPENAI_API_KEY) and Config.OPENAI_API_KEY != "your-key-here"
+
 
 # Initialize session state
 if 'results' not in st.session_state:
     st.session_state.results = None
 if 'cost_summary' not in st.session_state:
     st.session_state.cost_summary = None
+if 'batch_id' not in st.session_state:
+    st.session_state.batch_id = None
 
 # Header
 st.markdown('<div class="main-header">🤖 Meeting Summarizer</div>', unsafe_allow_html=True)
@@ -88,6 +154,12 @@ with st.sidebar:
         index=0,
         help="GPT-3.5: Fast & cheap ($0.01/meeting)\nGPT-4: Best quality ($0.20/meeting)"
     )
+    route_short_notes = st.checkbox(
+        "Route short notes",
+        value=False,
+        help=f"Summarize notes under {Config.SMALL_MODEL_MAX_INPUT_TOKENS} tokens with {Config.SMALL_MODEL_CHOICE}"
+    )
+    small_model = Config.SMALL_MODEL_CHOICE if route_short_notes else None
     
     st.markdown("---")
     
@@ -111,6 +183,12 @@ with st.sidebar:
     
     st.markdown("---")
     
+    # Display
+    st.subheader("🎨 Display")
+    show_effects = st.checkbox("Animations", value=False, help="Celebrate finished summaries with balloons")
+    
+    st.markdown("---")
+    
     # Info
     st.subheader("ℹ️ About")
     st.caption("Version 1.0.0")
@@ -118,7 +196,7 @@ with st.sidebar:
     
     # API key status
     st.markdown("---")
-    if Config.OPENAI_API_KEY and Config.OPENAI_API_KEY != "your-key-here":
+    if api_key_configured():
         st.success("✅ API key configured")
     else:
         st.error("❌ No API key found")
@@ -178,7 +256,7 @@ Next meeting: Tuesday Jan 22, 2pm
         )
         if uploaded_file is not None:
             notes = uploaded_file.read().decode('utf-8')
-            st.success(f"✅ Loaded {len(notes.split())} words from {uploaded_file.name}")
+            st.success(f"✅ Loaded {count_words(notes)} words from {uploaded_file.name}")
             with st.expander("Preview uploaded content"):
                 st.text(notes[:500] + "..." if len(notes) > 500 else notes)
     
@@ -209,30 +287,38 @@ Next meeting: Tuesday Jan 22, 2pm
         )
     
     # Process meeting
+    streamed_summary = False
     if process_button and notes.strip():
-        with st.spinner("🤖 AI is analyzing your meeting notes..."):
-            try:
-                # Create summarizer
-                summarizer = MeetingSummarizer(model=model, verbose=False)
-                
-                # Process
-                results = summarizer.process_meeting(
-                    notes=notes,
-                    date=date_str,
+        try:
+            # Own cost tracking: the cached summarizer is shared across sessions
+            summarizer = get_summarizer(model, small_model).session()
+            results = {}
+            
+            # Show the summary as it is generated
+            st.markdown("---")
+            st.subheader("📋 Meeting Summary")
+            st.write_stream(summarizer.stream_summary(notes, date=date_str, results=results))
+            streamed_summary = True
+            
+            # Email and brief are generated concurrently
+            with st.spinner("🤖 Writing follow-ups..."):
+                _agent_module().run_async(summarizer.agenerate_followups(
+                    results,
                     generate_email=generate_email,
                     generate_brief=generate_brief
-                )
-                
-                # Store in session state
-                st.session_state.results = results
-                st.session_state.cost_summary = summarizer.get_cost_summary()
-                
-                st.success("✅ Summary generated successfully!")
+                ))
+            
+            # Store in session state
+            st.session_state.results = results
+            st.session_state.cost_summary = summarizer.get_cost_summary()
+            
+            st.success("✅ Summary generated successfully!")
+            if show_effects:
                 st.balloons()
-                
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-                st.info("💡 Make sure your API key is configured in .env file")
+            
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+            st.info("💡 Make sure your API key is configured in .env file")
     
     # Display results
     if st.session_state.results:
@@ -246,7 +332,7 @@ Next meeting: Tuesday Jan 22, 2pm
             cost = st.session_state.cost_summary
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Model", cost['model'])
+                st.metric("Model", ", ".join(cost['models']))
             with col2:
                 st.metric("Tokens", f"{cost['total_tokens']:,}")
             with col3:
@@ -256,9 +342,10 @@ Next meeting: Tuesday Jan 22, 2pm
         
         st.markdown("---")
         
-        # Summary
-        st.subheader("📋 Meeting Summary")
-        st.markdown(results['summary'])
+        # Summary (already on screen if it was just streamed)
+        if not streamed_summary:
+            st.subheader("📋 Meeting Summary")
+            st.markdown(results['summary'])
         
         # Download button for summary
         st.download_button(
@@ -320,35 +407,22 @@ with tab2:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            results_list = []
-            total_cost = 0
+            summarizer = get_summarizer(model, small_model).session()
             
-            for i, file in enumerate(uploaded_files):
-                status_text.text(f"Processing {file.name}...")
-                
+            files = []
+            for file in uploaded_files:
                 try:
-                    notes = file.read().decode('utf-8')
-                    
-                    summarizer = MeetingSummarizer(model=model, verbose=False)
-                    result = summarizer.process_meeting(
-                        notes=notes,
-                        generate_email=generate_email,
-                        generate_brief=generate_brief
-                    )
-                    
-                    cost = summarizer.get_cost_summary()
-                    total_cost += cost['total_cost']
-                    
-                    results_list.append({
-                        'filename': file.name,
-                        'result': result,
-                        'cost': cost
-                    })
-                    
-                except Exception as e:
-                    st.warning(f"⚠️ Failed to process {file.name}: {str(e)}")
-                
-                progress_bar.progress((i + 1) / len(uploaded_files))
+                    files.append((file.name, file.read().decode('utf-8')))
+                except UnicodeDecodeError as e:
+                    st.warning(f"⚠️ Failed to read {file.name}: {str(e)}")
+            
+            # All files run concurrently (in-flight API requests are capped
+            # by the agent at Config.MAX_CONCURRENCY)
+            status_text.text(f"Processing {len(files)} files...")
+            results_list = _agent_module().run_async(_process_files(
+                summarizer, files, progress_bar, status_text, generate_email, generate_brief
+            ))
+            total_cost = summarizer.get_cost_summary()['total_cost']
             
             status_text.text("✅ Batch processing complete!")
             
@@ -377,6 +451,42 @@ with tab2:
                                 file_name=f"{item['filename']}_email.txt",
                                 key=f"download_email_{item['filename']}"
                             )
+        
+        # Batch API: half the price, results within 24h
+        st.caption("💸 Not in a hurry? The OpenAI Batch API costs 50% less and returns results within 24 hours.")
+        if st.button("📨 Submit as Batch (50% cheaper)"):
+            try:
+                notes_by_name = {file.name: file.getvalue().decode('utf-8') for file in uploaded_files}
+                
+                st.session_state.batch_id = get_summarizer(model, small_model).submit_meetings_batch(
+                    notes_by_name,
+                    generate_email=generate_email,
+                    generate_brief=generate_brief
+                )
+                
+                st.success(f"✅ Submitted batch {st.session_state.batch_id}")
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+    
+    # Pending Batch API job
+    if st.session_state.batch_id:
+        st.markdown("---")
+        st.subheader("📨 Submitted Batch")
+        st.text(f"Batch ID: {st.session_state.batch_id}")
+        
+        if st.button("🔄 Check status"):
+            try:
+                batch_results, followup_id = _agent_module().poll_batch(st.session_state.batch_id)
+                
+                if batch_results is None:
+                    st.info("⏳ Still running - check back later")
+                else:
+                    st.success(f"✅ Saved outputs for {len(batch_results)} files to {Config.OUTPUT_DIR}/")
+                    st.session_state.batch_id = followup_id
+                    if followup_id:
+                        st.info("📧 Emails/briefs were submitted as a follow-up batch - check again later")
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
 # TAB 3: Recent Summaries
 with tab3:
@@ -386,34 +496,31 @@ with tab3:
     
     if os.path.exists(output_dir):
         # Get all summary files
-        summary_files = sorted(
-            glob.glob(os.path.join(output_dir, "meeting_summary_*.md")),
-            key=os.path.getmtime,
-            reverse=True
-        )
+        total_summaries, summary_files = RecentIndex.snapshot(output_dir, limit=10)
         
         if summary_files:
-            st.info(f"📁 Found {len(summary_files)} recent summaries")
+            st.info(f"📁 Found {total_summaries} recent summaries")
             
             # Show recent summaries
-            for file_path in summary_files[:10]:  # Show last 10
-                filename = os.path.basename(file_path)
-                timestamp = datetime.fromtimestamp(os.path.getmtime(file_path))
+            for file_path, filename, mtime in summary_files:
+                timestamp = datetime.fromtimestamp(mtime)
                 
                 with st.expander(f"📄 {timestamp.strftime('%B %d, %Y %H:%M')} - {filename}"):
-                    try:
-                        with open(file_path, 'r') as f:
-                            content = f.read()
-                        st.markdown(content)
-                        
-                        st.download_button(
-                            "⬇️ Download",
-                            data=content,
-                            file_name=filename,
-                            key=f"download_{filename}"
-                        )
-                    except Exception as e:
-                        st.error(f"Error reading file: {e}")
+                    # Only read the file once the user asks for it
+                    if st.checkbox("Show summary", key=f"show_{filename}"):
+                        try:
+                            with open(file_path, 'r') as f:
+                                content = f.read()
+                            st.markdown(content)
+                            
+                            st.download_button(
+                                "⬇️ Download",
+                                data=content,
+                                file_name=filename,
+                                key=f"download_{filename}"
+                            )
+                        except Exception as e:
+                            st.error(f"Error reading file: {e}")
         else:
             st.info("📭 No summaries yet. Process your first meeting in the 'Summarize Meeting' tab!")
     else:
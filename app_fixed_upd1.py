@@ -7,21 +7,18 @@ Run with: streamlit run app.py
 
 import streamlit as st
 import os
+import hashlib
 from datetime import datetime
-from agent import MeetingSummarizer
+from typing import TYPE_CHECKING
 from config import Config
-import glob
+from prompts import Prompts
+from utils import count_words
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Page config
-st.set_page_config(
-    page_title="Meeting Summarizer",
-    page_icon="🤖",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+if TYPE_CHECKING:
+    from agent import MeetingSummarizer
 
-# Custom CSS - Dark theme with modern design
-st.markdown("""
+_CSS = """
 <style>
     /* Main theme colors */
     :root {
@@ -301,13 +298,270 @@ st.markdown("""
         color: var(--text-primary);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page config
+st.set_page_config(
+    page_title="Meeting Summarizer",
+    page_icon="🤖",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS - Dark theme with modern design (re-emitted on every rerun:
+# Streamlit only keeps the elements drawn by the current run)
+st.markdown(_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_summarizer(model: str, small_model: str = None) -> "MeetingSummarizer":
+    """
+    One summarizer (and HTTP connection pool) per model, shared across reruns
+    
+    The agent module (OpenAI SDK, tokenizer) is imported here on first use,
+    so the page and the history tab come up without paying for it.
+    """
+    from agent import MeetingSummarizer
+    return MeetingSummarizer(model=model, verbose=False, small_model=small_model)
+
+
+def has_enough_notes(notes: str) -> bool:
+    """
+    The agent's own too-short check, so the UI uses the same word threshold
+    
+    The agent module is only imported once there are notes to check.
+    """
+    if not notes or notes.isspace():
+        return False
+    
+    from agent import MeetingSummarizer
+    return MeetingSummarizer.has_enough_notes(notes)
+
+
+def api_key_configured() -> bool:
+    """Whether a real OpenAI API key is set"""
+    return bool(Config.OPENAI_API_KEY) and Config.OPENAI_API_KEY != "your-key-here"
+
+
+# Output files shown in the history tab: (prefix, extension, type, icon, badge class, label)
+HISTORY_FILE_TYPES = (
+    ("meeting_summary_", ".md", 'summary', '📋', 'badge-summary', 'Summary'),
+    ("meeting_followup_email_", ".txt", 'email', '📧', 'badge-email', 'Email'),
+    ("executive_brief_", ".txt", 'brief', '📊', 'badge-brief', 'Brief'),
+)
+HISTORY_PREFIXES = tuple(file_type[0] for file_type in HISTORY_FILE_TYPES)
+
+# Output choices in the sidebar: label -> (summary, email, brief)
+OUTPUT_FLAGS = {
+    "📋 Summary Only": (True, False, False),
+    "📧 Email Only": (False, True, False),
+    "📊 Brief Only": (False, False, True),
+    "📋📧 Summary + Email": (True, True, False),
+    "📋📊 Summary + Brief": (True, False, True),
+    "📧📊 Email + Brief": (False, True, True),
+    "📋📧📊 All Three": (True, True, True),
+}
+
+
+@st.cache_data(ttl=10)
+def scan_history(output_dir: str) -> tuple:
+    """
+    Find the saved summaries, emails and briefs with a single directory scan
+    
+    Returns:
+        Tuple of ({type: count}, [file info dicts newest first])
+    """
+    counts = {file_type[2]: 0 for file_type in HISTORY_FILE_TYPES}
+    files = []
+    
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            # One C-level prefix check rejects unrelated entries; is_file()
+            # comes from the directory listing, without a stat call
+            if not entry.name.startswith(HISTORY_PREFIXES) or not entry.is_file():
+                continue
+            
+            for prefix, extension, file_type, icon, badge_class, label in HISTORY_FILE_TYPES:
+                if entry.name.startswith(prefix) and entry.name.endswith(extension):
+                    counts[file_type] += 1
+                    files.append({
+                        'path': entry.path,
+                        'type': file_type,
+                        'icon': icon,
+                        'badge_class': badge_class,
+                        'label': label,
+                        'time': entry.stat().st_mtime
+                    })
+                    break
+    
+    files.sort(key=lambda x: x['time'], reverse=True)
+    return counts, files
+
+
+def _read_history_file(path: str) -> tuple:
+    """
+    Read one history file
+    
+    Returns:
+        Tuple of (text, raw bytes for the download button, None), or
+        (None, None, error message)
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return data.decode('utf-8'), data, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+@st.cache_data(max_entries=64)
+def read_history_files(files: tuple) -> dict:
+    """
+    Read history files in parallel
+    
+    Args:
+        files: (path, mtime) pairs; the mtime makes a changed file miss the cache
+        
+    Returns:
+        {path: (text, raw bytes, error message)} for each file
+    """
+    paths = [path for path, _ in files]
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+        return dict(zip(paths, executor.map(_read_history_file, paths)))
+
+
+def generate_followups(summarizer: "MeetingSummarizer", summary: str, generate_email: bool, generate_brief: bool) -> dict:
+    """
+    Generate the requested email and/or executive brief for a summary
+    
+    Both only depend on the summary: when both are wanted they come from a
+    single call, otherwise (or if that response can't be split) the two
+    calls run in parallel threads.
+    
+    Returns:
+        Dictionary with the requested 'email'/'brief'
+    """
+    if generate_email and generate_brief:
+        outputs = summarizer.generate_email_and_brief(summary)
+        if outputs:
+            return dict(zip(('email', 'brief'), outputs))
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {}
+        if generate_email:
+            futures['email'] = executor.submit(summarizer.generate_email, summary)
+        if generate_brief:
+            futures['brief'] = executor.submit(summarizer.generate_exec_brief, summary)
+        
+        return {key: future.result() for key, future in futures.items()}
+
+
+def make_preview(text: str, limit: int = 500) -> str:
+    """Shorten text for a preview, cutting at a word boundary (line breaks are kept)"""
+    if len(text) <= limit:
+        return text
+    
+    cut = text[:limit]
+    boundary = max(cut.rfind(' '), cut.rfind('\n'))
+    return (cut[:boundary] if boundary > 0 else cut) + "..."
+
+
+def generate_outputs(
+    summarizer: "MeetingSummarizer",
+    notes: str,
+    date: str,
+    generate_summary: bool,
+    generate_email: bool,
+    generate_brief: bool
+) -> dict:
+    """
+    Generate the selected outputs for one meeting
+    
+    Without a summary, the email and/or brief are written straight from
+    the notes, so no tokens are spent on a summary nobody sees. Notes too
+    short to summarize get the canned summary and nothing else, without
+    any API call (as in the agent's own pipelines).
+    
+    Returns:
+        Dictionary with the selected 'summary'/'email'/'brief'
+    """
+    if not summarizer.has_enough_notes(notes):
+        return {'summary': Prompts.format_insufficient_notes(notes, date)}
+    
+    if not generate_summary:
+        return generate_followups(summarizer, summarizer.notes_as_source(notes, date), generate_email, generate_brief)
+    
+    summary = summarizer.summarize_meeting(notes, date)
+    return {'summary': summary, **generate_followups(summarizer, summary, generate_email, generate_brief)}
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def cached_outputs(
+    notes_digest: str,
+    prompt_version: str,
+    model: str,
+    small_model: str,
+    date: str,
+    generate_summary: bool,
+    generate_email: bool,
+    generate_brief: bool,
+    _notes: str,
+    _summarizer: "MeetingSummarizer"
+) -> dict:
+    """
+    generate_outputs for tab 1, remembered for an hour
+    
+    Clicking Generate again with the same notes and options returns at once.
+    The notes are keyed by their digest, so Streamlit doesn't hash the full
+    text on every call (arguments starting with "_" aren't hashed), and the
+    prompt version keeps results from before a prompt edit out of the way.
+    The model names only key the cache; the calls go through _summarizer.
+    
+    Only the outputs are cached. The caller passes a session of the shared
+    summarizer and reads the cost from it, so a cache hit costs nothing.
+    
+    Returns:
+        Dictionary with the selected 'summary'/'email'/'brief'
+    """
+    return generate_outputs(_summarizer, _notes, date, generate_summary, generate_email, generate_brief)
+
+
+def process_notes(
+    summarizer: "MeetingSummarizer",
+    notes: str,
+    generate_summary: bool,
+    generate_email: bool,
+    generate_brief: bool
+) -> dict:
+    """
+    Generate the selected outputs for one meeting file
+    
+    Called from worker threads in batch mode, so it must not touch Streamlit.
+    
+    Returns:
+        Dictionary with the selected 'summary'/'email'/'brief' and a short
+        '<key>_preview' of the email and brief
+    """
+    result = generate_outputs(summarizer, notes, None, generate_summary, generate_email, generate_brief)
+    
+    for key in ('email', 'brief'):
+        if key in result:
+            result[f'{key}_preview'] = make_preview(result[key])
+    
+    return result
+
 
 # Initialize session state
 if 'results' not in st.session_state:
     st.session_state.results = None
 if 'cost_summary' not in st.session_state:
     st.session_state.cost_summary = None
+if 'downloads' not in st.session_state:
+    st.session_state.downloads = {}
+if 'batch' not in st.session_state:
+    st.session_state.batch = None
+
+# One clock read per rerun, shared by everything below
+now = datetime.now()
 
 # Header
 st.markdown('<div class="main-header">🤖 Meeting Summarizer</div>', unsafe_allow_html=True)
@@ -325,6 +579,12 @@ with st.sidebar:
         index=0,
         help="GPT-3.5: Fast & cheap\nGPT-4: Best quality"
     )
+    route_short_notes = st.checkbox(
+        "Route short notes",
+        value=False,
+        help=f"Summarize notes under {Config.SMALL_MODEL_MAX_INPUT_TOKENS} tokens with {Config.SMALL_MODEL_CHOICE}"
+    )
+    small_model = Config.SMALL_MODEL_CHOICE if route_short_notes else None
     
     st.markdown("---")
     
@@ -333,28 +593,14 @@ with st.sidebar:
     
     output_choice = st.radio(
         "Choose outputs:",
-        [
-            "📋 Summary Only",
-            "📧 Email Only", 
-            "📊 Brief Only",
-            "📋📧 Summary + Email",
-            "📋📊 Summary + Brief",
-            "📧📊 Email + Brief",
-            "📋📧📊 All Three"
-        ],
+        list(OUTPUT_FLAGS),
         index=None,  # No default selection
         help="Select what you want to generate"
     )
     
     # Parse selection
-    if output_choice:
-        generate_summary = "📋" in output_choice
-        generate_email = "📧" in output_choice
-        generate_brief = "📊" in output_choice
-    else:
-        generate_summary = False
-        generate_email = False
-        generate_brief = False
+    generate_summary, generate_email, generate_brief = OUTPUT_FLAGS.get(output_choice, (False, False, False))
+    if not output_choice:
         st.warning("⚠️ Please select what to generate")
     
     st.markdown("---")
@@ -364,17 +610,17 @@ with st.sidebar:
     use_custom_date = st.checkbox("Custom date", value=False)
     
     if use_custom_date:
-        meeting_date = st.date_input("Date", value=datetime.now())
+        meeting_date = st.date_input("Date", value=now)
         date_str = meeting_date.strftime("%B %d, %Y")
     else:
-        date_str = datetime.now().strftime("%B %d, %Y")
+        date_str = now.strftime("%B %d, %Y")
         st.info(f"📅 {date_str}")
     
     st.markdown("---")
     
     # API key status
     st.markdown("### 🔐 API Status")
-    if Config.OPENAI_API_KEY and Config.OPENAI_API_KEY != "your-key-here":
+    if api_key_configured():
         st.success("✅ Connected")
     else:
         st.error("❌ No API key")
@@ -387,6 +633,188 @@ with st.sidebar:
     st.caption("Version 1.0.0")
     st.caption("Built with ❤️")
 
+
+# Results and history are fragments: widgets inside them (downloads,
+# expanders) only rerun their own section, not the whole script
+@st.fragment
+def render_results():
+    """Show the latest results (interacting with them only reruns this section)"""
+    if st.session_state.results:
+        st.markdown("---")
+        
+        results = st.session_state.results
+        show_summary = st.session_state.get('show_summary', True)
+        stamp = st.session_state.results_stamp  # Same in all download file names
+        
+        # Cost metrics in cards
+        if st.session_state.cost_summary:
+            cost = st.session_state.cost_summary
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">Model</div>
+                    <div class="metric-value">{", ".join(cost['models'])}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">Tokens</div>
+                    <div class="metric-value">{cost['total_tokens']:,}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">API Calls</div>
+                    <div class="metric-value">{cost['api_calls']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col4:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">Cost</div>
+                    <div class="metric-value" style="color: var(--accent-green);">${cost['total_cost']:.4f}</div>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Summary (only if user selected it)
+        if show_summary and 'summary' in results:
+            st.markdown("### 📋 Meeting Summary")
+            st.markdown(f'<div class="markdown-text-container">{results["summary"]}</div>', unsafe_allow_html=True)
+            
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                st.download_button(
+                    label="⬇️ Download",
+                    data=st.session_state.downloads['summary'],
+                    file_name=f"summary_{stamp}.md",
+                    mime="text/markdown",
+                    use_container_width=True
+                )
+        
+        # Email (only if user selected it)
+        if 'email' in results:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("### 📧 Follow-up Email")
+            st.code(results['email'], language=None, wrap_lines=True)
+            
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                st.download_button(
+                    label="⬇️ Download",
+                    data=st.session_state.downloads['email'],
+                    file_name=f"email_{stamp}.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+        
+        # Executive Brief (only if user selected it)
+        if 'brief' in results:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("### 📊 Executive Brief")
+            st.code(results['brief'], language=None, wrap_lines=True)
+            
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                st.download_button(
+                    label="⬇️ Download",
+                    data=st.session_state.downloads['brief'],
+                    file_name=f"brief_{stamp}.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+
+
+@st.fragment
+def render_history():
+    """Show saved outputs (interacting with them only reruns this section)"""
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.markdown("### 📊 Recent Summaries")
+    with col2:
+        st.button("🔄 Refresh", key="refresh_history", on_click=scan_history.clear, use_container_width=True)
+    
+    output_dir = Config.OUTPUT_DIR
+    
+    if os.path.exists(output_dir):
+        # Get all files (summaries, emails, briefs), newest first
+        counts, all_files_list = scan_history(output_dir)
+        
+        total_files = sum(counts.values())
+        
+        if total_files > 0:
+            # Show counts
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("📋 Summaries", counts['summary'])
+            with col2:
+                st.metric("📧 Emails", counts['email'])
+            with col3:
+                st.metric("📊 Briefs", counts['brief'])
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            
+            # Read the files that are open (last 20) together, and only once
+            recent_files = all_files_list[:20]
+            open_files = tuple(
+                (file_info['path'], file_info['time'])
+                for file_info in recent_files
+                if st.session_state.get(f"open_{os.path.basename(file_info['path'])}")
+            )
+            contents = read_history_files(open_files) if open_files else {}
+            
+            # Show recent files (last 20)
+            for file_info in recent_files:
+                filename = os.path.basename(file_info['path'])
+                timestamp = datetime.fromtimestamp(file_info['time'])
+                
+                # Create expander label with colored badge
+                # Use different emoji/style for each type
+                if file_info['type'] == 'summary':
+                    badge = "🟣 Summary"
+                elif file_info['type'] == 'email':
+                    badge = "🟢 Email"
+                else:  # brief
+                    badge = "🟡 Brief"
+                
+                expander_label = f"{file_info['icon']} {timestamp.strftime('%b %d, %Y • %H:%M')}  •  {badge}"
+                
+                with st.expander(expander_label, expanded=False):
+                    # Only read the file once the user asks for it (ticking
+                    # this just reruns the history fragment)
+                    if st.checkbox("Show", key=f"open_{filename}"):
+                        content, data, error = contents.get(file_info['path']) or _read_history_file(file_info['path'])
+                        
+                        if error is not None:
+                            st.error(f"Error: {error}")
+                        else:
+                            if file_info['type'] == 'summary':
+                                st.markdown(content)
+                            else:
+                                st.code(content, language=None, wrap_lines=True)
+                            
+                            st.download_button(
+                                "⬇️ Download",
+                                data=data,
+                                file_name=filename,
+                                key=f"dl_{filename}",
+                                use_container_width=False
+                            )
+        else:
+            st.info("📭 No files yet. Process your first meeting!")
+    else:
+        st.info("📭 No output directory yet. Process a meeting to create it!")
+
+
 # Main content with tabs
 tab1, tab2, tab3 = st.tabs(["📝 Summarize", "📂 Batch Process", "📊 History"])
 
@@ -443,8 +871,8 @@ Action Items:
             label_visibility="collapsed"
         )
         if uploaded_file is not None:
-            notes = uploaded_file.read().decode('utf-8')
-            st.success(f"✅ Loaded {len(notes.split())} words from **{uploaded_file.name}**")
+            notes = uploaded_file.getvalue().decode('utf-8')
+            st.success(f"✅ Loaded {count_words(notes)} words from **{uploaded_file.name}**")
     
     # Tips expander
     with st.expander("💡 Tips for Better Results"):
@@ -470,41 +898,40 @@ Action Items:
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Process button
+    has_notes = has_enough_notes(notes)
+    if notes and not has_notes:
+        st.caption(f"Add at least {Config.MIN_INPUT_WORDS} words of notes to generate")
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         process_button = st.button(
             "🚀 Generate Summary",
             type="primary",
             use_container_width=True,
-            disabled=not notes.strip() or not output_choice  # Disabled if no notes OR no selection
+            disabled=not has_notes or not output_choice  # Disabled if no notes OR no selection
         )
     
     # Process meeting
-    if process_button and notes.strip() and output_choice:
+    if process_button and has_notes and output_choice:
         with st.spinner("🤖 AI is analyzing your meeting..."):
             try:
-                # Create summarizer
-                summarizer = MeetingSummarizer(model=model, verbose=False)
-                
-                # Always generate summary first (needed for email/brief generation)
-                summary = summarizer.summarize_meeting(notes, date_str)
-                
-                results = {'summary': summary}
-                
-                # Generate email if requested
-                if generate_email:
-                    email = summarizer.generate_email(summary)
-                    results['email'] = email
-                
-                # Generate brief if requested
-                if generate_brief:
-                    brief = summarizer.generate_exec_brief(summary)
-                    results['brief'] = brief
+                # Only what was selected: without a summary, the email/brief
+                # are written straight from the notes
+                notes_digest = hashlib.blake2b(notes.encode('utf-8'), digest_size=16).hexdigest()
+                # Own cost tracking: the cached summarizer is shared across sessions
+                summarizer = get_summarizer(model, small_model).session()
+                results = cached_outputs(
+                    notes_digest, Prompts.VERSION, model, small_model, date_str, generate_summary, generate_email, generate_brief, notes, summarizer
+                )
+                cost_summary = summarizer.get_cost_summary()  # Nothing spent on a cache hit
                 
                 # Store in session state
                 st.session_state.results = results
-                st.session_state.cost_summary = summarizer.get_cost_summary()
-                st.session_state.show_summary = generate_summary
+                st.session_state.results_stamp = now.strftime('%Y%m%d_%H%M%S')
+                # Encoded once here instead of by every download button on every rerun
+                st.session_state.downloads = {key: text.encode('utf-8') for key, text in results.items()}
+                st.session_state.cost_summary = cost_summary
+                # Also shown when it is the canned summary for too-short notes
+                st.session_state.show_summary = 'summary' in results
                 
                 st.success("✅ Generated successfully!")
                 st.balloons()
@@ -514,98 +941,7 @@ Action Items:
                 st.info("💡 Check your .env configuration")
     
     # Display results
-    if st.session_state.results:
-        st.markdown("---")
-        
-        results = st.session_state.results
-        show_summary = st.session_state.get('show_summary', True)
-        
-        # Cost metrics in cards
-        if st.session_state.cost_summary:
-            cost = st.session_state.cost_summary
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Model</div>
-                    <div class="metric-value">{cost['model'].split('-')[0].upper()}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Tokens</div>
-                    <div class="metric-value">{cost['total_tokens']:,}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">API Calls</div>
-                    <div class="metric-value">{cost['api_calls']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col4:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Cost</div>
-                    <div class="metric-value" style="color: var(--accent-green);">${cost['total_cost']:.4f}</div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Summary (only if user selected it)
-        if show_summary and 'summary' in results:
-            st.markdown("### 📋 Meeting Summary")
-            st.markdown(f'<div class="markdown-text-container">{results["summary"]}</div>', unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([3, 1])
-            with col2:
-                st.download_button(
-                    label="⬇️ Download",
-                    data=results['summary'],
-                    file_name=f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                    mime="text/markdown",
-                    use_container_width=True
-                )
-        
-        # Email (only if user selected it)
-        if 'email' in results:
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("### 📧 Follow-up Email")
-            st.text_area("", results['email'], height=300, key="email_output", label_visibility="collapsed")
-            
-            col1, col2 = st.columns([3, 1])
-            with col2:
-                st.download_button(
-                    label="⬇️ Download",
-                    data=results['email'],
-                    file_name=f"email_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-        
-        # Executive Brief (only if user selected it)
-        if 'brief' in results:
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("### 📊 Executive Brief")
-            st.text_area("", results['brief'], height=300, key="brief_output", label_visibility="collapsed")
-            
-            col1, col2 = st.columns([3, 1])
-            with col2:
-                st.download_button(
-                    label="⬇️ Download",
-                    data=results['brief'],
-                    file_name=f"brief_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+    render_results()
 
 # TAB 2: Batch Processing
 with tab2:
@@ -637,208 +973,120 @@ with tab2:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                results_list = []
-                total_cost = 0
-                
-                for i, file in enumerate(uploaded_files):
-                    status_text.text(f"Processing {file.name}...")
-                    
+                # Read the uploads here: Streamlit objects aren't thread-safe
+                files = []
+                for file in uploaded_files:
                     try:
-                        notes = file.read().decode('utf-8')
-                        
-                        summarizer = MeetingSummarizer(model=model, verbose=False)
-                        
-                        # Generate summary first (always needed)
-                        summary = summarizer.summarize_meeting(notes)
-                        result = {'summary': summary}
-                        
-                        # Generate email if requested
-                        if generate_email:
-                            email = summarizer.generate_email(summary)
-                            result['email'] = email
-                        
-                        # Generate brief if requested
-                        if generate_brief:
-                            brief = summarizer.generate_exec_brief(summary)
-                            result['brief'] = brief
-                        
-                        cost = summarizer.get_cost_summary()
-                        total_cost += cost['total_cost']
-                        
-                        results_list.append({
-                            'filename': file.name,
-                            'result': result,
-                            'cost': cost,
-                            'show_summary': generate_summary
-                        })
-                        
-                    except Exception as e:
+                        files.append((file.name, file.getvalue().decode('utf-8')))
+                    except UnicodeDecodeError:
                         st.warning(f"⚠️ Failed: {file.name}")
-                    
-                    progress_bar.progress((i + 1) / len(uploaded_files))
                 
-                status_text.text("✅ Complete!")
+                # Own cost tracking: the cached summarizer is shared across sessions
+                summarizer = get_summarizer(model, small_model).session()
+                finished = {}
+                
+                # Files are processed in parallel; progress is reported as each finishes
+                status_text.text(f"Processing {len(files)} files...")
+                with ThreadPoolExecutor(max_workers=max(1, min(Config.MAX_CONCURRENCY, len(files)))) as executor:
+                    futures = {
+                        executor.submit(process_notes, summarizer, notes, generate_summary, generate_email, generate_brief): (i, name)
+                        for i, (name, notes) in enumerate(files)
+                    }
+                    
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i, name = futures[future]
+                        try:
+                            result = future.result()
+                            finished[i] = {
+                                'filename': name,
+                                'result': result,
+                                'show_summary': 'summary' in result  # Selected, or canned for too-short notes
+                            }
+                        except Exception:
+                            st.warning(f"⚠️ Failed: {name}")
+                        
+                        progress_bar.progress(done / len(files))
                 
-                # Summary
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Processed", f"{len(results_list)}/{len(uploaded_files)}")
-                with col2:
-                    st.metric("Total Cost", f"${total_cost:.4f}")
+                results_list = [finished[i] for i in sorted(finished)]
                 
-                # Show results
+                # Kept in session state with the download bytes encoded once,
+                # so a download click doesn't wipe or re-encode the batch
                 for item in results_list:
-                    with st.expander(f"📄 {item['filename']}"):
-                        # Show summary if selected
-                        if item.get('show_summary', True) and 'summary' in item['result']:
-                            st.markdown(item['result']['summary'])
-                        
-                        # Show email if generated
-                        if 'email' in item['result']:
-                            st.markdown("### 📧 Email")
-                            st.text(item['result']['email'][:500] + "..." if len(item['result']['email']) > 500 else item['result']['email'])
-                        
-                        # Show brief if generated
-                        if 'brief' in item['result']:
-                            st.markdown("### 📊 Brief")
-                            st.text(item['result']['brief'][:500] + "..." if len(item['result']['brief']) > 500 else item['result']['brief'])
-                        
-                        # Download buttons
-                        cols = st.columns(3)
-                        col_idx = 0
-                        
-                        if item.get('show_summary', True) and 'summary' in item['result']:
-                            with cols[col_idx]:
-                                st.download_button(
-                                    "⬇️ Summary",
-                                    data=item['result']['summary'],
-                                    file_name=f"{item['filename']}_summary.md",
-                                    key=f"dl_s_{item['filename']}"
-                                )
-                            col_idx += 1
-                        
-                        if 'email' in item['result']:
-                            with cols[col_idx]:
-                                st.download_button(
-                                    "⬇️ Email",
-                                    data=item['result']['email'],
-                                    file_name=f"{item['filename']}_email.txt",
-                                    key=f"dl_e_{item['filename']}"
-                                )
-                            col_idx += 1
-                        
-                        if 'brief' in item['result']:
-                            with cols[col_idx]:
-                                st.download_button(
-                                    "⬇️ Brief",
-                                    data=item['result']['brief'],
-                                    file_name=f"{item['filename']}_brief.txt",
-                                    key=f"dl_b_{item['filename']}"
-                                )
-
-# TAB 3: Recent Summaries - IMPROVED WITH FILE TYPE BADGES
-with tab3:
-    st.markdown("### 📊 Recent Summaries")
-    
-    output_dir = Config.OUTPUT_DIR
-    
-    if os.path.exists(output_dir):
-        # Get all files (summaries, emails, briefs)
-        all_files = {
-            'summaries': sorted(glob.glob(os.path.join(output_dir, "meeting_summary_*.md")), key=os.path.getmtime, reverse=True),
-            'emails': sorted(glob.glob(os.path.join(output_dir, "meeting_followup_email_*.txt")), key=os.path.getmtime, reverse=True),
-            'briefs': sorted(glob.glob(os.path.join(output_dir, "executive_brief_*.txt")), key=os.path.getmtime, reverse=True)
-        }
-        
-        total_files = len(all_files['summaries']) + len(all_files['emails']) + len(all_files['briefs'])
+                    item['downloads'] = {
+                        key: item['result'][key].encode('utf-8')
+                        for key in ('summary', 'email', 'brief') if key in item['result']
+                    }
+                
+                st.session_state.batch = {
+                    'results': results_list,
+                    'total_files': len(uploaded_files),
+                    'total_cost': summarizer.get_cost_summary()['total_cost']
+                }
+                
+                status_text.text("✅ Complete!")
         
-        if total_files > 0:
-            # Show counts
-            col1, col2, col3 = st.columns(3)
+        batch = st.session_state.batch
+        if batch:
+            # Summary
+            col1, col2 = st.columns(2)
             with col1:
-                st.metric("📋 Summaries", len(all_files['summaries']))
+                st.metric("Processed", f"{len(batch['results'])}/{batch['total_files']}")
             with col2:
-                st.metric("📧 Emails", len(all_files['emails']))
-            with col3:
-                st.metric("📊 Briefs", len(all_files['briefs']))
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            # Combine and sort all files by time
-            all_files_list = []
-            
-            for file_path in all_files['summaries']:
-                all_files_list.append({
-                    'path': file_path,
-                    'type': 'summary',
-                    'icon': '📋',
-                    'badge_class': 'badge-summary',
-                    'label': 'Summary',
-                    'time': os.path.getmtime(file_path)
-                })
-            
-            for file_path in all_files['emails']:
-                all_files_list.append({
-                    'path': file_path,
-                    'type': 'email',
-                    'icon': '📧',
-                    'badge_class': 'badge-email',
-                    'label': 'Email',
-                    'time': os.path.getmtime(file_path)
-                })
-            
-            for file_path in all_files['briefs']:
-                all_files_list.append({
-                    'path': file_path,
-                    'type': 'brief',
-                    'icon': '📊',
-                    'badge_class': 'badge-brief',
-                    'label': 'Brief',
-                    'time': os.path.getmtime(file_path)
-                })
-            
-            # Sort by time (newest first)
-            all_files_list.sort(key=lambda x: x['time'], reverse=True)
+                st.metric("Total Cost", f"${batch['total_cost']:.4f}")
             
-            # Show recent files (last 20)
-            for file_info in all_files_list[:20]:
-                filename = os.path.basename(file_info['path'])
-                timestamp = datetime.fromtimestamp(file_info['time'])
-                
-                # Create expander label with colored badge
-                # Use different emoji/style for each type
-                if file_info['type'] == 'summary':
-                    badge = "🟣 Summary"
-                elif file_info['type'] == 'email':
-                    badge = "🟢 Email"
-                else:  # brief
-                    badge = "🟡 Brief"
-                
-                expander_label = f"{file_info['icon']} {timestamp.strftime('%b %d, %Y • %H:%M')}  •  {badge}"
-                
-                with st.expander(expander_label, expanded=False):
-                    try:
-                        with open(file_info['path'], 'r') as f:
-                            content = f.read()
-                        
-                        if file_info['type'] == 'summary':
-                            st.markdown(content)
-                        else:
-                            st.text_area("", content, height=300, key=f"view_{filename}", label_visibility="collapsed")
-                        
-                        st.download_button(
-                            "⬇️ Download",
-                            data=content,
-                            file_name=filename,
-                            key=f"dl_{filename}",
-                            use_container_width=False
-                        )
-                    except Exception as e:
-                        st.error(f"Error: {e}")
-        else:
-            st.info("📭 No files yet. Process your first meeting!")
-    else:
-        st.info("📭 No output directory yet. Process a meeting to create it!")
+            # Show results
+            for item in batch['results']:
+                with st.expander(f"📄 {item['filename']}"):
+                    # Show summary if selected
+                    if item.get('show_summary', True) and 'summary' in item['result']:
+                        st.markdown(item['result']['summary'])
+                    
+                    # Show email if generated
+                    if 'email' in item['result']:
+                        st.markdown("### 📧 Email")
+                        st.text(item['result']['email_preview'])
+                    
+                    # Show brief if generated
+                    if 'brief' in item['result']:
+                        st.markdown("### 📊 Brief")
+                        st.text(item['result']['brief_preview'])
+                    
+                    # Download buttons
+                    cols = st.columns(3)
+                    col_idx = 0
+                    
+                    if item.get('show_summary', True) and 'summary' in item['result']:
+                        with cols[col_idx]:
+                            st.download_button(
+                                "⬇️ Summary",
+                                data=item['downloads']['summary'],
+                                file_name=f"{item['filename']}_summary.md",
+                                key=f"dl_s_{item['filename']}"
+                            )
+                        col_idx += 1
+                    
+                    if 'email' in item['result']:
+                        with cols[col_idx]:
+                            st.download_button(
+                                "⬇️ Email",
+                                data=item['downloads']['email'],
+                                file_name=f"{item['filename']}_email.txt",
+                                key=f"dl_e_{item['filename']}"
+                            )
+                        col_idx += 1
+                    
+                    if 'brief' in item['result']:
+                        with cols[col_idx]:
+                            st.download_button(
+                                "⬇️ Brief",
+                                data=item['downloads']['brief'],
+                                file_name=f"{item['filename']}_brief.txt",
+                                key=f"dl_b_{item['filename']}"
+                            )
+
+# TAB 3: Recent Summaries - IMPROVED WITH FILE TYPE BADGES
+with tab3:
+    render_history()
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,313 @@
+"""
+Response caches for Meeting Summarizer
+"""
+
+import os
+import sqlite3
+import threading
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+# numpy is imported where the semantic tier uses it, so the exact-match
+# cache (the default) doesn't pay for it
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def normalize_embedding(embedding) -> "np.ndarray":
+    """
+    Convert an embedding to a unit-length float32 vector
+    
+    Args:
+        embedding: Embedding values (list or array)
+        
+    Returns:
+        Normalized float32 numpy array
+    """
+    import numpy as np
+    
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@lru_cache(maxsize=16)
+def _key_prefix(model: str, system_prompt: Optional[str]) -> bytes:
+    """Encoded start of a cache key (the system prompt is static, so this is done once)"""
+    return f"{model}|{system_prompt or ''}|".encode('utf-8')
+
+
+def make_cache_key(model: str, system_prompt: str, prompt: str) -> str:
+    """
+    Build an exact-match cache key for a request
+    
+    Args:
+        model: Model name
+        system_prompt: System prompt (may be None)
+        prompt: User prompt
+        
+    Returns:
+        Hex digest identifying the request
+    """
+    key = hashlib.blake2b(_key_prefix(model, system_prompt), digest_size=16)
+    key.update(prompt.encode('utf-8'))
+    return key.hexdigest()
+
+
+class ExactCache:
+    """
+    Cache of LLM responses keyed by a hash of (model, system prompt, prompt)
+    
+    Backed by SQLite so the CLI and the web UI can share it safely, with the
+    most recently used responses also kept in memory so repeat hits skip the
+    database. Calls are serialized with a lock, so one instance can be used
+    from several threads.
+    """
+    
+    def __init__(self, path: str, memory_size: int = 512):
+        """
+        Open (or create) the cache database
+        
+        Args:
+            path: Path to the SQLite database file
+            memory_size: Number of responses to keep in memory (0 disables it)
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_size = memory_size
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None"""
+        with self._lock:
+            response = self._memory.get(key)
+            if response is not None:
+                self._memory.move_to_end(key)
+                return response
+            
+            row = self.conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self._remember(key, row[0])
+        
+        return row[0] if row else None
+    
+    def set(self, key: str, response: str):
+        """Store a response under a key"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, datetime.now().isoformat())
+            )
+            self.conn.commit()
+            self._remember(key, response)
+    
+    def _remember(self, key: str, response: str):
+        """Keep a response in memory, evicting the least recently used (lock held)"""
+        if not self._memory_size:
+            return
+        
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+class SemanticCache:
+    """
+    Cache of LLM responses looked up by prompt embedding similarity
+    
+    Rows are stored in SQLite; the embeddings are also kept in memory as one
+    contiguous float32 matrix so a lookup is a single dot product. The matrix
+    grows by doubling, so an insert doesn't copy it. Calls are serialized
+    with a lock, so one instance can be used from several threads.
+    
+    Rows older than the TTL are ignored by lookups, so recurring meetings
+    don't keep matching a summary from months ago even while the cache stays
+    open (the web UI keeps it for the life of the process). They are deleted
+    when the cache is opened and when the matrix would otherwise have to grow.
+    """
+    
+    INITIAL_CAPACITY = 64
+    
+    def __init__(self, path: str, ttl_days: Optional[float] = 30):
+        """
+        Open (or create) the cache database
+        
+        Args:
+            path: Path to the SQLite database file
+            ttl_days: Age in days after which responses expire (None keeps them forever)
+        """
+        import numpy as np
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY,
+                embedding BLOB NOT NULL,
+                prompt TEXT NOT NULL,
+                response TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        if ttl_days is not None:
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (self._cutoff().isoformat(),))
+        self.conn.commit()
+        
+        # Load existing rows into memory
+        rows = self.conn.execute(
+            "SELECT embedding, response, model, created_at FROM responses ORDER BY id"
+        ).fetchall()
+        
+        # Only the first _size rows of the arrays are in use
+        self._size = len(rows)
+        self._responses = [row[1] for row in rows]
+        self._models = np.array([row[2] for row in rows], dtype=object)
+        self._created = np.array([datetime.fromisoformat(row[3]).timestamp() for row in rows], dtype=np.float64)
+        if rows:
+            self._matrix = np.ascontiguousarray(
+                np.stack([np.frombuffer(row[0], dtype=np.float32) for row in rows])
+            )
+        else:
+            self._matrix = None
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _cutoff(self) -> datetime:
+        """Creation time before which responses have expired"""
+        return datetime.now() - timedelta(days=self.ttl_days)
+    
+    def _drop_expired(self):
+        """Delete expired rows and compact the arrays (the lock must be held)"""
+        if self.ttl_days is None or not self._size:
+            return
+        
+        cutoff = self._cutoff()
+        keep = self._created[:self._size] >= cutoff.timestamp()
+        if keep.all():
+            return
+        
+        self.conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff.isoformat(),))
+        self.conn.commit()
+        
+        size = int(keep.sum())
+        self._matrix[:size] = self._matrix[:self._size][keep]
+        self._models[:size] = self._models[:self._size][keep]
+        self._created[:size] = self._created[:self._size][keep]
+        self._responses = [response for response, kept in zip(self._responses, keep) if kept]
+        self._size = size
+    
+    def _reserve_row(self, dim: int):
+        """Make room for one more row, doubling the arrays when full (the lock must be held)"""
+        import numpy as np
+        
+        if self._matrix is None:
+            self._matrix = np.empty((self.INITIAL_CAPACITY, dim), dtype=np.float32)
+            self._models = np.empty(self.INITIAL_CAPACITY, dtype=object)
+            self._created = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+            return
+        
+        if self._size < len(self._matrix):
+            return
+        
+        # Full: expired rows go first, and only then is everything copied
+        self._drop_expired()
+        if self._size < len(self._matrix):
+            return
+        
+        capacity = 2 * len(self._matrix)
+        matrix = np.empty((capacity, dim), dtype=np.float32)
+        models = np.empty(capacity, dtype=object)
+        created = np.empty(capacity, dtype=np.float64)
+        matrix[:self._size] = self._matrix[:self._size]
+        models[:self._size] = self._models[:self._size]
+        created[:self._size] = self._created[:self._size]
+        self._matrix, self._models, self._created = matrix, models, created
+    
+    def lookup(self, embedding: "np.ndarray", model: str, threshold: float) -> Optional[str]:
+        """
+        Find the most similar cached response for a model
+        
+        Args:
+            embedding: Normalized prompt embedding
+            model: Model the response must have been generated with
+            threshold: Minimum cosine similarity for a hit
+            
+        Returns:
+            Cached response text, or None if nothing is similar enough
+        """
+        import numpy as np
+        
+        with self._lock:
+            if not self._size:
+                return None
+            
+            size = self._size
+            similarities = self._matrix[:size] @ embedding
+            similarities[self._models[:size] != model] = -1.0
+            if self.ttl_days is not None:
+                similarities[self._created[:size] < self._cutoff().timestamp()] = -1.0
+            
+            best = int(np.argmax(similarities))
+            if similarities[best] >= threshold:
+                return self._responses[best]
+        
+        return None
+    
+    def add(self, embedding: "np.ndarray", prompt: str, response: str, model: str):
+        """
+        Store a response
+        
+        Args:
+            embedding: Normalized prompt embedding
+            prompt: Prompt that produced the response
+            response: LLM response text
+            model: Model used
+        """
+        now = datetime.now()
+        
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO responses (embedding, prompt, response, model, created_at) VALUES (?, ?, ?, ?, ?)",
+                (embedding.tobytes(), prompt, response, model, now.isoformat())
+            )
+            self.conn.commit()
+            
+            self._reserve_row(embedding.shape[-1])
+            self._matrix[self._size] = embedding
+            self._models[self._size] = model
+            self._created[self._size] = now.timestamp()
+            self._responses.append(response)
+            self._size += 1
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
@@ -19,12 +19,58 @@ class Config:
     DEFAULT_MODEL = "gpt-3.5-turbo"  # Fast and cheap
     PREMIUM_MODEL = "gpt-4"          # Higher quality
     
+    # Notes under SMALL_MODEL_MAX_INPUT_TOKENS are summarized by this cheaper,
+    # faster model instead of the chosen one (None = always use the chosen model).
+    # Off by default; --small-model and the app's routing toggle switch it on
+    # with SMALL_MODEL_CHOICE.
+    SMALL_MODEL = None
+    SMALL_MODEL_CHOICE = "gpt-4o-mini"
+    SMALL_MODEL_MAX_INPUT_TOKENS = 500
+    
     # Temperature (0 = deterministic, 1 = creative)
     TEMPERATURE = 0.3  # Low for consistent formatting
     
     # Token limits
     MAX_INPUT_TOKENS = 6000   # ~4500 words
-    MAX_OUTPUT_TOKENS = 2000  # ~1500 words
+    MAX_OUTPUT_TOKENS = None  # Cap for the single-call JSON output (None = no cap)
+    MIN_INPUT_WORDS = 20      # Shorter notes get a canned summary without an API call
+    
+    # Output caps per document (fewer tokens = faster generation)
+    SUMMARY_MAX_TOKENS = 1500
+    EMAIL_MAX_TOKENS = 600
+    BRIEF_MAX_TOKENS = 400
+    BRIEF_STOP = ["\n\n---\n\n"]  # Stop if the model starts adding extra sections
+    
+    # Models that support JSON mode; with these, the summary and its email
+    # and/or brief are generated in a single API call for short notes
+    JSON_MODE_MODELS = {"gpt-3.5-turbo", "gpt-4-turbo", "gpt-4o", "gpt-4o-mini"}
+    COMBINED_MAX_INPUT_TOKENS = 2000  # Longer notes use separate (parallel) calls
+    
+    # HTTP connection pool
+    MAX_KEEPALIVE_CONNECTIONS = 32
+    MAX_CONNECTIONS = 64
+    REQUEST_TIMEOUT = 60.0  # seconds
+    CONNECT_TIMEOUT = 5.0   # seconds
+    
+    # Concurrency (parallel files in batch mode and in-flight requests,
+    # keep under your rate limits)
+    MAX_CONCURRENCY = 8
+    
+    # Attempts per API call on rate limits, connection and server errors
+    MAX_RETRIES = 6
+    
+    # Response cache:
+    #   "off"      - always call the API
+    #   "exact"    - reuse responses for identical prompts
+    #   "semantic" - exact, then also reuse responses for near-identical prompts
+    CACHE_MODE = "exact"
+    CACHE_MODES = ("off", "exact", "semantic")
+    CACHE_PATH = ".cache/responses.db"
+    CACHE_MEMORY_SIZE = 512  # Recent exact-cache responses also kept in memory
+    SEMANTIC_CACHE_PATH = ".cache/semantic_cache.db"
+    SEMANTIC_CACHE_THRESHOLD = 0.97  # Minimum cosine similarity for a hit
+    SEMANTIC_CACHE_TTL_DAYS = 30  # Similar-prompt matches older than this expire
+    EMBEDDING_MODEL = "text-embedding-3-small"
     
     # Output settings
     OUTPUT_DIR = "output"
@@ -38,16 +84,16 @@ class Config:
     
     @classmethod
     def validate(cls):
-        """Validate configuration"""
+        """
+        Validate configuration
+        
+        Called when a summarizer is created rather than on import, so the
+        web UI can load and report a missing key itself. Output directories
+        are created by whatever writes to them.
+        """
         if not cls.OPENAI_API_KEY and not cls.ANTHROPIC_API_KEY:
             raise ValueError(
                 "No API key found! Set OPENAI_API_KEY or ANTHROPIC_API_KEY in .env file"
             )
         
-        # Create output directory if it doesn't exist
-        os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
-        
-        return True
-
-# Validate on import
-Config.validate()
\ No newline at end of file
+        return True
\ No newline at end of file
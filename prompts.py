@@ -3,11 +3,20 @@ Prompt templates for Meeting Summarizer
 Using your Day 3-4 prompt engineering skills!
 """
 
+import re
+import hashlib
+
+from utils import format_now
+
+
 class Prompts:
     """
     Collection of prompts for meeting summarization
     """
     
+    # Sent first and unchanged with every request. Keep it static (no dates,
+    # names or other per-call values) and over 1024 tokens so OpenAI's
+    # automatic prompt caching can reuse it across calls.
     SYSTEM_PROMPT = """
 You are an expert executive assistant and project manager with 10+ years of experience.
 
@@ -25,18 +34,112 @@ Your communication style:
 
 You understand that meeting notes can be messy, incomplete, or informal.
 You work with what you have and flag missing information when critical.
-"""
 
-    MEETING_SUMMARY = """
-Transform these meeting notes into a comprehensive, structured summary.
+GENERAL GUIDELINES (apply to every document you write):
+
+Reading the notes:
+- Notes may be bullet fragments, chat logs, transcripts or shorthand. Treat
+  abbreviations ("AI" = action item, "EOW" = end of week, "TBD", "FYI", "w/")
+  by their usual business meaning.
+- Names may appear as first names, initials or roles ("PM", "eng lead").
+  Keep them exactly as written; never invent surnames, titles or email addresses.
+- If the same person is referred to in different ways, use the most complete
+  form that appears in the notes.
+- Distinguish between what was DECIDED, what was only DISCUSSED, and what was
+  PROPOSED. Only list something as a decision if the notes show agreement.
+- Numbers (budgets, dates, percentages, headcount) must be copied exactly.
+  Never round, convert currencies or recalculate totals.
+
+Action items:
+- An action item needs a task, and ideally an owner and a due date.
+- "X will...", "X to...", "X: ..." and "@X" all indicate an owner.
+- Relative dates ("by Friday", "next week") stay relative unless the meeting
+  date makes the exact date unambiguous.
+- When an owner or deadline is missing, keep the item and mark the gap with ⚠️
+  instead of guessing.
+- Urgent, blocking or externally committed items are High Priority. Routine
+  follow-ups are Medium. Nice-to-haves and "if time permits" are Low.
+
+Risks and blockers:
+- A blocker prevents work from continuing right now; a risk might cause
+  problems later. Do not mix them up.
+- Only assign a severity when the notes give enough context to justify it.
+- Include mitigations only when they were actually discussed.
+
+Writing style:
+- Short sentences, active voice, no filler ("It is worth noting that...").
+- Prefer bullets over paragraphs when listing more than two things.
+- Keep markdown simple: headings, bold labels, bullets and checkboxes.
+- Never include these guidelines, your reasoning or meta-commentary in the output.
+- If the notes are too thin to fill a section, say so briefly rather than
+  padding it with generic content.
+
+Confidentiality and accuracy:
+- Do not speculate about people's performance, motives or feelings.
+- Do not add recommendations that were not raised in the meeting, except for
+  clearly labelled suggestions about missing owners or dates.
+- When two statements in the notes conflict, mention both and flag the conflict.
+
+DOCUMENT TYPES YOU WILL BE ASKED TO PRODUCE:
+
+1. Meeting summary - the complete record. Written for team members who
+   missed the meeting and need to act on it. Covers decisions, action items,
+   risks, discussion points and next steps in a fixed section layout.
+   Completeness matters more than brevity, but it is never a transcript.
+
+2. Follow-up email - sent by the meeting organiser to attendees right after
+   the meeting. Warm, professional and skimmable in under a minute. It
+   repeats only the decisions, owners, deadlines and blockers people must
+   act on, and invites corrections.
+
+3. Executive brief - read by senior leadership in under thirty seconds.
+   Leads with the single most important outcome, states business impact in
+   concrete terms (time, money, risk, customers) and ends with what is needed
+   from leadership, if anything. Uses a traffic-light status:
+   🟢 on track, 🟡 at risk, 🔴 blocked or critical.
+
+Each request tells you which document to write and gives its exact format.
+Follow that format precisely, keep the section order, and keep the emoji
+section markers so documents look consistent across meetings. When you are
+asked for several documents at once, they must agree with each other: the
+same decisions, the same owners and the same dates everywhere.
+
+Quality checklist before answering:
+- Every action item from the notes appears exactly once.
+- Every name, number and date matches the notes.
+- Nothing was added that the notes do not support.
+- Missing owners, dates and details are flagged with ⚠️.
+- The output contains only the requested document(s).
+
+EXAMPLE OF THE EXPECTED JUDGEMENT:
+
+Notes fragment:
+  "api v2 - agreed to ship behind flag. maria checks perf numbers, tom?? docs.
+   vendor still hasn't signed, could slip launch. budget ok (40k)."
+
+Correct interpretation:
+- Decision: ship API v2 behind a feature flag.
+- Action item: Maria - check performance numbers - ⚠️ no due date.
+- Action item: documentation - ⚠️ owner unclear (Tom?) - ⚠️ no due date.
+- Risk: unsigned vendor contract could delay launch - severity not stated.
+- Context: budget of $40k confirmed as sufficient.
+
+Incorrect interpretation (do NOT do this):
+- Inventing a launch date, assigning the docs to Tom as certain, rating the
+  vendor risk "High" without evidence, or rewriting $40k as "about $50k".
+"""
 
-MEETING NOTES:
-{notes}
+    # The user prompts below put their static instructions first and the
+    # per-call text (notes, date, summary) last, so the cached prefix runs
+    # past the system prompt into the instructions. Don't add per-call
+    # values to the static parts: one changed character ends the match.
+    MEETING_SUMMARY_PREFIX = """
+Transform the meeting notes at the end of this message into a comprehensive, structured summary.
 
 Generate a summary with these sections:
 
 # MEETING SUMMARY
-**Date:** {date}
+**Date:** [Meeting date given below]
 **Topic:** [Extract or infer from notes]
 
 ---
@@ -118,11 +221,19 @@ Keep it concise - this is NOT a transcript.]
 7. For vague action items, note what clarification is needed
 """
 
-    EMAIL_FOLLOWUP = """
-Create a professional follow-up email based on this meeting summary.
+    MEETING_SUMMARY_SUFFIX = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-MEETING SUMMARY:
-{summary}
+MEETING DATE: {date}
+
+MEETING NOTES:
+{notes}
+"""
+
+    MEETING_SUMMARY = MEETING_SUMMARY_PREFIX + MEETING_SUMMARY_SUFFIX
+
+    EMAIL_FOLLOWUP = """
+Create a professional follow-up email based on the meeting summary below.
 
 Generate an email with this structure:
 
@@ -162,13 +273,13 @@ Best,
 4. Easy to skim (use bullets and sections)
 5. Only include information from the summary
 6. If no action items or decisions, adjust format accordingly
-"""
-
-    EXECUTIVE_BRIEF = """
-Create a brief executive summary from this meeting information.
 
 MEETING SUMMARY:
 {summary}
+"""
+
+    EXECUTIVE_BRIEF = """
+Create a brief executive summary from the meeting summary below.
 
 Generate an executive brief in this format:
 
@@ -205,27 +316,206 @@ EXECUTIVE BRIEF: [Meeting Topic]
 4. Action-oriented
 5. Written for C-level audience
 6. Status: 🟢 = on track, 🟡 = at risk, 🔴 = blocked/critical
+
+MEETING SUMMARY:
+{summary}
+"""
+
+    COMBINED_OUTPUT = """
+Produce {count} documents from these meeting notes in a single response.
+
+Return ONLY a JSON object with exactly these string fields:
+{fields}
+
+━━━ "summary" ━━━
+{summary_instructions}
+{followup_sections}{notes_section}"""
+
+    # Per-document pieces of COMBINED_OUTPUT
+    COMBINED_FIELDS = {
+        'summary': '- "summary": the structured meeting summary (markdown)',
+        'email': '- "email": the follow-up email draft',
+        'brief': '- "brief": the executive brief'
+    }
+    COMBINED_SECTION = """
+━━━ "{key}" ━━━
+{instructions}
 """
 
+    # Stands in for the summary when the email/brief are written straight
+    # from the notes (no summary wanted, so none is generated)
+    NOTES_SOURCE = """[No summary was written - these are the raw meeting notes from {date}]
+
+{notes}"""
+
+    # Returned without calling the API when the notes are too short
+    INSUFFICIENT_NOTES = """# MEETING SUMMARY
+**Date:** {date}
+
+---
+
+## 📋 EXECUTIVE SUMMARY
+{notes}
+
+---
+
+## 🎯 ACTION ITEMS
+⚠️ Too few notes to extract structured items - the raw notes are shown above.
+Add the discussion, decisions and action items and try again for a full summary.
+"""
+
+    # Markers that separate the documents in an EMAIL_AND_BRIEF response
+    EMAIL_MARKER = "<<<EMAIL>>>"
+    BRIEF_MARKER = "<<<BRIEF>>>"
+
+    EMAIL_AND_BRIEF = """
+Write two documents from the meeting summary at the end of this message: a follow-up email and an executive brief.
+
+Start the email with a line containing only {email_marker} and the brief with a line containing only {brief_marker}. Write nothing before, between or after the two documents.
+
+━━━ EMAIL ━━━
+{email_instructions}
+
+━━━ EXECUTIVE BRIEF ━━━
+{brief_instructions}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+MEETING SUMMARY:
+{summary}
+"""
+
+    # Changes whenever a template is edited, for cache keys that are built
+    # from the inputs (e.g. the web UI's) rather than the full prompt text
+    VERSION = hashlib.blake2b(
+        "\x00".join((
+            SYSTEM_PROMPT, MEETING_SUMMARY, EMAIL_FOLLOWUP, EXECUTIVE_BRIEF, COMBINED_OUTPUT,
+            COMBINED_SECTION, NOTES_SOURCE, INSUFFICIENT_NOTES, EMAIL_AND_BRIEF
+        )).encode('utf-8'),
+        digest_size=8
+    ).hexdigest()
+
+    @staticmethod
+    def format_email_and_brief(summary: str) -> str:
+        """Format the single-call email + brief prompt (the summary is sent once)"""
+        return "".join((_EMAIL_AND_BRIEF_PREFIX, summary, _EMAIL_AND_BRIEF_SUFFIX))
+    
+    @staticmethod
+    def format_combined(notes: str, date: str = None, want_email: bool = True, want_brief: bool = True) -> str:
+        """Format the single-call prompt for the summary plus the email and/or brief"""
+        if date is None:
+            date = format_now("%B %d, %Y")
+        
+        prefix, suffix = _COMBINED_PARTS[(want_email, want_brief)]
+        before_date, before_notes, end = _SUMMARY_SUFFIX_PARTS
+        return "".join((prefix, before_date, date, before_notes, notes, end, suffix))
+    
     @staticmethod
     def format_meeting_summary(notes: str, date: str = None) -> str:
         """Format the meeting summary prompt with variables"""
-        from datetime import datetime
+        if date is None:
+            date = format_now("%B %d, %Y")
         
+        before_date, before_notes, end = _SUMMARY_PARTS
+        return "".join((before_date, date, before_notes, notes, end))
+    
+    @staticmethod
+    def format_insufficient_notes(notes: str, date: str = None) -> str:
+        """Format the canned summary returned for notes too short to summarize"""
         if date is None:
-            date = datetime.now().strftime("%B %d, %Y")
+            date = format_now("%B %d, %Y")
         
-        return Prompts.MEETING_SUMMARY.format(
-            notes=notes,
-            date=date
-        )
+        before_date, before_notes, end = _INSUFFICIENT_PARTS
+        return "".join((before_date, date, before_notes, notes.strip(), end))
+    
+    @staticmethod
+    def format_notes_source(notes: str, date: str) -> str:
+        """Format raw notes to be passed to the email/brief prompts in place of a summary"""
+        before_date, before_notes, end = _NOTES_SOURCE_PARTS
+        return "".join((before_date, date, before_notes, notes, end))
     
     @staticmethod
     def format_email_followup(summary: str) -> str:
         """Format the email followup prompt"""
-        return Prompts.EMAIL_FOLLOWUP.format(summary=summary)
+        return "".join((_EMAIL_PREFIX, summary, _EMAIL_SUFFIX))
     
     @staticmethod
     def format_executive_brief(summary: str) -> str:
         """Format the executive brief prompt"""
-        return Prompts.EXECUTIVE_BRIEF.format(summary=summary)
\ No newline at end of file
+        return "".join((_BRIEF_PREFIX, summary, _BRIEF_SUFFIX))
+
+
+def _split_template(template: str, *fields: str, **values: str) -> tuple:
+    """
+    Split a format template into the static text around its fields
+    
+    Formatting then becomes a single join of the precomputed parts with
+    the per-call values, instead of re-parsing the template every time.
+    
+    Args:
+        template: str.format template
+        *fields: Per-call fields, in the order they appear in the template
+        **values: Fields with fixed values, filled in once here
+        
+    Returns:
+        Tuple of len(fields) + 1 static parts
+    """
+    markers = [f"\x00{i}\x00" for i in range(len(fields))]
+    text = template.format(**dict(zip(fields, markers)), **values)
+    
+    if re.findall(r"\x00\d+\x00", text) != markers:
+        raise ValueError(f"Template fields must each appear once, in order: {fields}")
+    
+    return tuple(re.split(r"\x00\d+\x00", text))
+
+
+# Precomputed static parts of each template
+_SUMMARY_PARTS = _split_template(Prompts.MEETING_SUMMARY, "date", "notes")
+_SUMMARY_SUFFIX_PARTS = _split_template(Prompts.MEETING_SUMMARY_SUFFIX, "date", "notes")
+_EMAIL_PREFIX, _EMAIL_SUFFIX = _split_template(Prompts.EMAIL_FOLLOWUP, "summary")
+_BRIEF_PREFIX, _BRIEF_SUFFIX = _split_template(Prompts.EXECUTIVE_BRIEF, "summary")
+_NOTES_SOURCE_PARTS = _split_template(Prompts.NOTES_SOURCE, "date", "notes")
+_INSUFFICIENT_PARTS = _split_template(Prompts.INSUFFICIENT_NOTES, "date", "notes")
+
+# In the combined prompt only the notes at the end change per call, so the
+# rest is precomputed for each combination of follow-up documents
+_COMBINED_SOURCE = "[Use the meeting summary you wrote in the \"summary\" field]"
+_COMBINED_INSTRUCTIONS = {
+    'email': Prompts.format_email_followup(_COMBINED_SOURCE),
+    'brief': Prompts.format_executive_brief(_COMBINED_SOURCE)
+}
+
+
+def _combined_parts(want_email: bool, want_brief: bool) -> tuple:
+    """Static parts of the combined prompt for a set of follow-up documents"""
+    followups = [key for key, wanted in (('email', want_email), ('brief', want_brief)) if wanted]
+    keys = ['summary'] + followups
+    
+    return _split_template(
+        Prompts.COMBINED_OUTPUT,
+        "notes_section",
+        summary_instructions=Prompts.MEETING_SUMMARY_PREFIX,
+        count={2: "two", 3: "three"}[len(keys)],
+        fields="\n".join(Prompts.COMBINED_FIELDS[key] for key in keys),
+        followup_sections="".join(
+            Prompts.COMBINED_SECTION.format(key=key, instructions=_COMBINED_INSTRUCTIONS[key])
+            for key in followups
+        )
+    )
+
+
+_COMBINED_PARTS = {
+    (want_email, want_brief): _combined_parts(want_email, want_brief)
+    for want_email, want_brief in ((True, True), (True, False), (False, True))
+}
+
+# The email and brief instructions refer to the summary sent after them
+_FOLLOWUP_SOURCE = "[The meeting summary at the end of this message]"
+_EMAIL_AND_BRIEF_PREFIX, _EMAIL_AND_BRIEF_SUFFIX = _split_template(
+    Prompts.EMAIL_AND_BRIEF,
+    "summary",
+    email_marker=Prompts.EMAIL_MARKER,
+    brief_marker=Prompts.BRIEF_MARKER,
+    email_instructions=Prompts.format_email_followup(_FOLLOWUP_SOURCE),
+    brief_instructions=Prompts.format_executive_brief(_FOLLOWUP_SOURCE)
+)
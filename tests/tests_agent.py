@@ -4,13 +4,35 @@ Unit tests for Meeting Summarizer
 
 import os
 import sys
+import json
+import asyncio
+import hashlib
+import tempfile
+import time
+import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import agent
 from agent import MeetingSummarizer
-from utils import count_words, estimate_tokens, truncate_text
+from config import Config
+from prompts import Prompts
+from utils import (
+    count_words, estimate_tokens, truncate_text, read_file, write_file, write_all,
+    iter_text_files, RecentIndex, MMAP_THRESHOLD
+)
+from cache import SemanticCache, normalize_embedding, make_cache_key
 
 
-def test_basic_summarization():
+@pytest.fixture(scope="module")
+def summarizer():
+    """One summarizer (and HTTP connection pool) shared by the API tests"""
+    # Response cache off, so every call is actually made and billed
+    summarizer = MeetingSummarizer(verbose=False, cache_mode="off")
+    yield summarizer
+    summarizer.close()
+
+
+def test_basic_summarization(summarizer):
     """Test basic meeting summarization"""
     notes = """
     Quick team sync.
@@ -18,9 +40,9 @@ def test_basic_summarization():
     John will handle backend.
     Sarah on frontend.
     Need to launch by March.
+    Budget approved for two contractors.
     """
     
-    summarizer = MeetingSummarizer(verbose=False)
     summary = summarizer.summarize_meeting(notes)
     
     assert summary is not None
@@ -52,15 +74,234 @@ def test_utils():
     print("✅ Utility functions test passed")
 
 
-def test_cost_tracking():
+class _CharEncoder:
+    """One token per character, for exact cuts without tiktoken"""
+    
+    def encode(self, text, disallowed_special=()):
+        return list(text)
+    
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def test_truncation_boundary():
+    """Test that a period right at the cut isn't taken for a sentence end"""
+    text = "x" * 84 + " Done. Ships v2.0 with the rest of the notes after it."
+    assert text.index("v2.") + 3 == 100  # The cut falls right after "v2."
+    
+    for truncated, _ in (truncate_text(text, max_tokens=25), truncate_text(text, max_tokens=100, encoder=_CharEncoder())):
+        assert truncated.startswith("x" * 84 + " Done.")
+        assert "v2" not in truncated
+    
+    print("✅ Truncation boundary test passed")
+
+
+def test_semantic_cache():
+    """Test semantic cache lookups"""
+    tmp_dir = tempfile.mkdtemp()
+    cache = SemanticCache(os.path.join(tmp_dir, "cache.db"))
+    
+    emb = normalize_embedding([1.0, 0.0, 0.0])
+    cache.add(emb, "prompt", "cached response", "gpt-3.5-turbo")
+    
+    # Near-identical prompt hits, unrelated prompt and other model miss
+    assert cache.lookup(normalize_embedding([1.0, 0.1, 0.0]), "gpt-3.5-turbo", 0.93) == "cached response"
+    assert cache.lookup(normalize_embedding([0.0, 1.0, 0.0]), "gpt-3.5-turbo", 0.93) is None
+    assert cache.lookup(emb, "gpt-4", 0.93) is None
+    cache.close()
+    
+    # Entries persist across instances
+    cache = SemanticCache(os.path.join(tmp_dir, "cache.db"))
+    assert len(cache) == 1
+    assert cache.lookup(emb, "gpt-3.5-turbo", 0.93) == "cached response"
+    cache.close()
+    
+    # ...until they outlive the TTL
+    cache = SemanticCache(os.path.join(tmp_dir, "cache.db"), ttl_days=0)
+    assert len(cache) == 0
+    cache.close()
+    
+    # Entries also expire while the cache stays open
+    cache = SemanticCache(os.path.join(tmp_dir, "expiring.db"), ttl_days=0.1 / 86400)
+    cache.add(emb, "prompt", "cached response", "gpt-3.5-turbo")
+    assert cache.lookup(emb, "gpt-3.5-turbo", 0.93) == "cached response"
+    time.sleep(0.2)
+    assert cache.lookup(emb, "gpt-3.5-turbo", 0.93) is None
+    cache.close()
+    
+    # The in-memory matrix grows past its initial capacity
+    cache = SemanticCache(os.path.join(tmp_dir, "growing.db"))
+    count = SemanticCache.INITIAL_CAPACITY * 2 + 1
+    unit = lambda i: normalize_embedding([1.0 if j == i else 0.0 for j in range(count)])
+    for i in range(count):
+        cache.add(unit(i), f"prompt {i}", f"response {i}", "gpt-3.5-turbo")
+    assert len(cache) == count
+    assert cache.lookup(unit(3), "gpt-3.5-turbo", 0.93) == "response 3"
+    assert cache.lookup(unit(count - 1), "gpt-3.5-turbo", 0.93) == f"response {count - 1}"
+    cache.close()
+    
+    print("✅ Semantic cache test passed")
+
+
+def test_cache_key():
+    """Test that cache keys match a hash of the whole request (existing caches stay valid)"""
+    for system_prompt in (Prompts.SYSTEM_PROMPT, None):
+        data = f"gpt-4|{system_prompt or ''}|Notes: café".encode('utf-8')
+        assert make_cache_key("gpt-4", system_prompt, "Notes: café") == hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    print("✅ Cache key test passed")
+
+
+def test_file_io():
+    """Test file writing, reading (including the memory-mapped path) and listing"""
+    tmp_dir = tempfile.mkdtemp()
+    
+    # The directory is created on demand; line endings are normalized on read
+    path = write_file(os.path.join(tmp_dir, "new", "notes.txt"), "line one\r\nline two\r\n")
+    assert read_file(path) == "line one\nline two\n"
+    
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+    
+    paths = write_all([(os.path.join(tmp_dir, "a.txt"), "a"), (os.path.join(tmp_dir, "b.txt"), b"b")])
+    assert [read_file(p) for p in paths] == ["a", "b"]
+    
+    # Files over the threshold are read through a memory map
+    lines = MMAP_THRESHOLD // 4 + 1
+    big = write_file(os.path.join(tmp_dir, "big.txt"), "é\r\n" * lines)
+    assert os.path.getsize(big) > MMAP_THRESHOLD
+    assert read_file(big) == "é\n" * lines
+    
+    # Only visible .txt files are listed
+    os.mkdir(os.path.join(tmp_dir, "folder.txt"))
+    write_file(os.path.join(tmp_dir, ".hidden.txt"), "x")
+    write_file(os.path.join(tmp_dir, "notes.md"), "x")
+    assert sorted(os.path.basename(p) for p in iter_text_files(tmp_dir)) == ["a.txt", "b.txt", "big.txt"]
+    
+    print("✅ File I/O test passed")
+
+
+def test_recent_index():
+    """Test that the recent-summary index sees our writes and everyone else's"""
+    tmp_dir = tempfile.mkdtemp()
+    
+    def save(name: str):
+        path = os.path.join(tmp_dir, name)
+        RecentIndex.reserve(path)
+        write_file(path, name)
+        RecentIndex.push(path)
+        time.sleep(0.01)  # Keep directory mtimes apart
+    
+    save("meeting_summary_1.md")
+    assert RecentIndex.snapshot(tmp_dir)[0] == 1
+    
+    # A summary written by another process just before ours is still listed
+    write_file(os.path.join(tmp_dir, "meeting_summary_other.md"), "other")
+    time.sleep(0.01)
+    save("meeting_summary_2.md")
+    save("meeting_followup_email_2.txt")
+    
+    total, entries = RecentIndex.snapshot(tmp_dir)
+    assert total == 3
+    assert entries[0][1] == "meeting_summary_2.md"
+    assert {entry[1] for entry in entries} == {"meeting_summary_1.md", "meeting_summary_2.md", "meeting_summary_other.md"}
+    assert len(RecentIndex.snapshot(tmp_dir, limit=2)[1]) == 2
+    
+    print("✅ Recent index test passed")
+
+
+def test_batch_dedup():
+    """Test that a batch run sends identical notes once, longest first, and copies the outputs"""
+    in_dir = tempfile.mkdtemp()
+    out_dir = tempfile.mkdtemp()
+    
+    short = "Meeting A. " + "Team agreed to ship the release on Friday after review. " * 3
+    long = "Meeting C. " + "Budget review covered hiring, vendors and the roadmap for next quarter. " * 10
+    for name, notes in (("a.txt", short), ("b.txt", short), ("c.txt", long)):
+        write_file(os.path.join(in_dir, name), notes)
+    
+    calls = []
+    
+    async def fake_acall_llm(self, prompt, system_prompt=None, response_format=None, out_path=None, task=None, model=None):
+        meeting = "A" if "Meeting A." in prompt else "C"
+        calls.append(meeting)
+        return json.dumps({"summary": f"Summary {meeting}", "email": f"Email {meeting}"})
+    
+    # No request is sent: the LLM call is stubbed and a placeholder key is enough
+    saved = (MeetingSummarizer._acall_llm, Config.OPENAI_API_KEY, Config.CACHE_MODE)
+    MeetingSummarizer._acall_llm = fake_acall_llm
+    Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "sk-offline-test"
+    Config.CACHE_MODE = "off"
+    try:
+        results = asyncio.run(agent.abatch_process(in_dir, out_dir, concurrency=1))
+    finally:
+        MeetingSummarizer._acall_llm, Config.OPENAI_API_KEY, Config.CACHE_MODE = saved
+    
+    assert calls == ["C", "A"]
+    
+    by_file = {result['source_file']: result for result in results}
+    assert sorted(by_file) == ["a.txt", "b.txt", "c.txt"]
+    assert by_file['b.txt']['summary'] == by_file['a.txt']['summary'] == "Summary A"
+    assert by_file['b.txt']['summary_file'] != by_file['a.txt']['summary_file']
+    assert read_file(by_file['b.txt']['summary_file']) == "Summary A"
+    assert read_file(by_file['b.txt']['email_file']) == "Email A"
+    
+    print("✅ Batch dedup test passed")
+
+
+def test_prompt_prefix():
+    """Test that prompts keep the per-call text at the end"""
+    first = Prompts.format_meeting_summary("Team sync notes.", "January 1, 2024")
+    second = Prompts.format_meeting_summary("Budget review notes.", "March 3, 2024")
+    
+    # Everything before the date is shared, so it can be served from the prompt cache
+    prefix = os.path.commonprefix([first, second])
+    assert prefix.startswith(Prompts.MEETING_SUMMARY_PREFIX)
+    assert first.endswith("Team sync notes.\n")
+    
+    email = Prompts.format_email_followup("A short summary.")
+    assert email.startswith(Prompts.EMAIL_FOLLOWUP.split("{summary}")[0])
+    
+    print("✅ Prompt prefix test passed")
+
+
+def test_insufficient_notes():
+    """Test that near-empty notes are skipped without an API call"""
+    tmp_dir = tempfile.mkdtemp()
+    
+    # No request is sent, so a placeholder key lets this run offline
+    api_key = Config.OPENAI_API_KEY
+    Config.OPENAI_API_KEY = api_key or "sk-offline-test"
+    try:
+        summarizer = MeetingSummarizer(verbose=False, cache_mode="off")
+    finally:
+        Config.OPENAI_API_KEY = api_key
+    
+    results = summarizer.process_meeting("   Quick sync, nothing new.  \n", date="January 1, 2024", output_dir=tmp_dir)
+    
+    assert results['skipped']
+    assert "January 1, 2024" in results['summary']
+    assert "Quick sync, nothing new." in results['summary']
+    assert os.path.exists(results['summary_file'])
+    assert 'email' not in results
+    assert summarizer.get_cost_summary()['api_calls'] == 0
+    
+    print("✅ Insufficient notes test passed")
+
+
+def test_cost_tracking(summarizer):
     """Test cost tracking"""
-    notes = "Quick meeting. John will do task A. Sarah will do task B."
+    notes = "Quick meeting. John will do task A by Friday. Sarah will do task B next week. Mike reviews both before the release."
     
-    summarizer = MeetingSummarizer(verbose=False)
-    summarizer.summarize_meeting(notes)
+    # Count only this test's call on the shared summarizer
+    session = summarizer.session()
+    calls_before = summarizer.api_calls
+    session.summarize_meeting(notes)
     
-    cost_summary = summarizer.get_cost_summary()
+    cost_summary = session.get_cost_summary()
     
+    assert summarizer.api_calls == calls_before
     assert cost_summary['api_calls'] > 0
     assert cost_summary['total_tokens'] > 0
     assert cost_summary['total_cost'] >= 0
@@ -74,8 +315,18 @@ if __name__ == "__main__":
     
     try:
         test_utils()
-        test_basic_summarization()
-        test_cost_tracking()
+        test_truncation_boundary()
+        test_semantic_cache()
+        test_cache_key()
+        test_file_io()
+        test_recent_index()
+        test_batch_dedup()
+        test_prompt_prefix()
+        test_insufficient_notes()
+        
+        with MeetingSummarizer(verbose=False, cache_mode="off") as shared:
+            test_basic_summarization(shared)
+            test_cost_tracking(shared)
         
         print("\n" + "="*50)
         print("✅ ALL TESTS PASSED!")
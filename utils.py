@@ -3,13 +3,27 @@ Utility functions for Meeting Summarizer
 """
 
 import os
+import re
+import mmap
+import time
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
+
+# Files larger than this (in bytes) are read through a memory map
+MMAP_THRESHOLD = 1_000_000
+
 
 def read_file(filepath: str) -> str:
     """
     Read content from a file
     
+    Large files are memory-mapped and decoded straight from the page cache,
+    without first copying the whole file into a Python bytes buffer. The
+    path is looked up once: the size comes from the open file.
+    
     Args:
         filepath: Path to file to read
         
@@ -19,17 +33,133 @@ def read_file(filepath: str) -> str:
     Raises:
         FileNotFoundError: If file doesn't exist
     """
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"File not found: {filepath}")
+    try:
+        f = open(filepath, 'rb')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+    with f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8')
+        else:
+            text = f.read().decode('utf-8')
+    
+    # Match text-mode reads, which translate line endings
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
 
-def write_file(filepath: str, content: str) -> str:
+def write_file(filepath: str, content, sync: bool = False) -> str:
     """
     Write content to a file
     
+    The content is encoded up front and handed to the OS in a single
+    write call, rather than going through a buffered text file.
+    
+    Args:
+        filepath: Path to write to
+        content: Content to write (str, or already-encoded bytes)
+        sync: Whether to fsync the file before closing it
+        
+    Returns:
+        The filepath that was written to
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        fd = os.open(filepath, flags, 0o666)  # Narrowed by the umask, as with open()
+    except FileNotFoundError:
+        # Create the directory only when it's missing, not on every write
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        fd = os.open(filepath, flags, 0o666)
+    
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    
+    return filepath
+
+
+def write_all(files: list, directory: str = None) -> list:
+    """
+    Write and fsync several files, then sync their directory once
+    
+    Args:
+        files: (filepath, content) pairs
+        directory: Directory to sync (default: that of the first file)
+        
+    Returns:
+        The filepaths that were written to
+    """
+    paths = [write_file(filepath, content, sync=True) for filepath, content in files]
+    
+    # One fsync makes all the new directory entries durable (not
+    # supported on Windows, where directories can't be opened)
+    if paths and hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(directory or os.path.dirname(paths[0]) or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    return paths
+
+
+def open_output_file(filepath: str):
+    """
+    Open a file for writing text, creating its directory if needed
+    
+    Args:
+        filepath: Path to write to
+        
+    Returns:
+        Open text file object
+    """
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    return open(filepath, 'w', encoding='utf-8')
+
+
+async def aread_file(filepath: str) -> str:
+    """
+    Async version of read_file (doesn't block the event loop)
+    
+    Args:
+        filepath: Path to file to read
+        
+    Returns:
+        File contents as string
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    import asyncio
+    import aiofiles
+    
+    try:
+        size = os.stat(filepath).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
+    
+    # Large files go through read_file's memory map, off the event loop
+    if size > MMAP_THRESHOLD:
+        return await asyncio.to_thread(read_file, filepath)
+    
+    async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+        return await f.read()
+
+
+async def awrite_file(filepath: str, content: str) -> str:
+    """
+    Async version of write_file (doesn't block the event loop)
+    
     Args:
         filepath: Path to write to
         content: Content to write
@@ -37,19 +167,186 @@ def write_file(filepath: str, content: str) -> str:
     Returns:
         The filepath that was written to
     """
-    # Create directory if it doesn't exist
+    import aiofiles
+    
     os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+        await f.write(content)
     
     return filepath
 
 
+async def aopen_output_file(filepath: str):
+    """
+    Async version of open_output_file
+    
+    Args:
+        filepath: Path to write to
+        
+    Returns:
+        Open aiofiles text file object
+    """
+    import aiofiles
+    
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    return await aiofiles.open(filepath, 'w', encoding='utf-8')
+
+
+def iter_text_files(directory: str) -> Iterator[str]:
+    """
+    Yield the paths of the .txt files in a directory
+    
+    Uses os.scandir, so entries are yielded as the directory is read and the
+    file type usually comes from the directory listing without a stat call.
+    Hidden files are skipped, like glob does.
+    
+    Args:
+        directory: Directory to scan
+        
+    Yields:
+        Path of each .txt file
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.txt') and not entry.name.startswith('.') and entry.is_file():
+                yield entry.path
+
+
+class RecentIndex:
+    """
+    In-memory index of the newest summary files in each output directory
+    
+    The summarizer creates its output files with reserve and pushes each
+    one once it is written, so listing the recent summaries doesn't need a
+    directory scan. A snapshot only rescans when the directory's mtime shows
+    something else (e.g. another process) changed it.
+    """
+    
+    PREFIX = "meeting_summary_"
+    SUFFIX = ".md"
+    MAXLEN = 10
+    
+    # Directory -> (directory mtime, total summaries, deque of (path, filename, mtime))
+    _dirs = {}
+    # Reserved path -> directory mtime from just before the file was created
+    _pending = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _scan(cls, directory: str, dir_mtime: int) -> tuple:
+        """Index a directory from a single scan"""
+        with os.scandir(directory) as entries:
+            summaries = [
+                (entry.path, entry.name, entry.stat().st_mtime)
+                for entry in entries
+                if entry.name.startswith(cls.PREFIX) and entry.name.endswith(cls.SUFFIX)
+            ]
+        
+        summaries.sort(key=lambda summary: summary[2], reverse=True)
+        return dir_mtime, len(summaries), deque(summaries[:cls.MAXLEN], maxlen=cls.MAXLEN)
+    
+    @classmethod
+    def reserve(cls, path: str):
+        """
+        Create an empty file for an output that is about to be written
+        
+        The directory's mtime from just before is kept, so push can tell
+        whether anything else changed the directory in the meantime.
+        
+        Args:
+            path: Path of the new file
+            
+        Raises:
+            FileExistsError: If the file already exists
+        """
+        dir_mtime = os.stat(os.path.dirname(path) or '.').st_mtime_ns
+        open(path, 'x').close()
+        
+        with cls._lock:
+            cls._pending[path] = dir_mtime
+    
+    @classmethod
+    def push(cls, path: str):
+        """
+        Record a reserved file once its content is written (only summaries are listed)
+        
+        Args:
+            path: Path of the file
+        """
+        directory = os.path.dirname(path) or '.'
+        name = os.path.basename(path)
+        key = os.path.abspath(directory)
+        
+        with cls._lock:
+            dir_mtime = cls._pending.pop(path, None)
+            state = cls._dirs.get(key)
+            if state is None:
+                return  # Not indexed yet, the first snapshot scans it
+            
+            indexed_mtime, count, entries = state
+            if dir_mtime is None or indexed_mtime != dir_mtime:
+                # The directory changed after it was indexed and before this
+                # file was created: let the next snapshot rescan it
+                del cls._dirs[key]
+                return
+            
+            is_summary = name.startswith(cls.PREFIX) and name.endswith(cls.SUFFIX)
+            if is_summary and not any(entry[0] == path for entry in entries):
+                entries.appendleft((path, name, os.stat(path).st_mtime))
+                count += 1
+            
+            cls._dirs[key] = (os.stat(directory).st_mtime_ns, count, entries)
+    
+    @classmethod
+    def snapshot(cls, directory: str, limit: int = None) -> tuple:
+        """
+        List the newest summaries in a directory
+        
+        Args:
+            directory: Output directory
+            limit: Maximum number of summaries to return (at most MAXLEN)
+            
+        Returns:
+            Tuple of (total number of summaries, [(path, filename, mtime), ...]
+            newest first)
+        """
+        dir_mtime = os.stat(directory).st_mtime_ns
+        
+        with cls._lock:
+            state = cls._dirs.get(os.path.abspath(directory))
+            if state is None or state[0] != dir_mtime:
+                state = cls._dirs[os.path.abspath(directory)] = cls._scan(directory, dir_mtime)
+            
+            return state[1], list(state[2])[:limit]
+
+
+@lru_cache(maxsize=4)
+def _format_time(epoch_seconds: int, fmt: str) -> str:
+    """strftime for a whole second (memoized: two formats, current and last second)"""
+    return datetime.fromtimestamp(epoch_seconds).strftime(fmt)
+
+
+def format_now(fmt: str) -> str:
+    """
+    Format the current local time, reusing the result within the same second
+    
+    Args:
+        fmt: strftime format (e.g. "%B %d, %Y")
+        
+    Returns:
+        Formatted time
+    """
+    return _format_time(int(time.time()), fmt)
+
+
 def generate_filename(base_name: str, extension: str, output_dir: str = "output") -> str:
     """
     Generate a timestamped filename
     
+    A numeric suffix is added if a file with the same timestamp already
+    exists (e.g. when several meetings are processed in the same second).
+    
     Args:
         base_name: Base name for file (e.g., "meeting_summary")
         extension: File extension (e.g., "md", "txt")
@@ -58,9 +355,15 @@ def generate_filename(base_name: str, extension: str, output_dir: str = "output"
     Returns:
         Full filepath
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{base_name}_{timestamp}.{extension}"
-    return os.path.join(output_dir, filename)
+    timestamp = format_now("%Y%m%d_%H%M%S")
+    filepath = os.path.join(output_dir, f"{base_name}_{timestamp}.{extension}")
+    
+    counter = 1
+    while os.path.exists(filepath):
+        filepath = os.path.join(output_dir, f"{base_name}_{timestamp}_{counter}.{extension}")
+        counter += 1
+    
+    return filepath
 
 
 def count_words(text: str) -> int:
@@ -76,54 +379,178 @@ def count_words(text: str) -> int:
     return len(text.split())
 
 
-def estimate_tokens(text: str) -> int:
+@lru_cache(maxsize=None)
+def get_encoder(model: str):
+    """
+    Get the tiktoken encoder for a model (memoized per model)
+    
+    Args:
+        model: Model name (e.g., "gpt-3.5-turbo")
+        
+    Returns:
+        tiktoken Encoding, or None if tiktoken or its encoding data
+        isn't available (token counts then fall back to an estimate)
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model name - use the encoding of current chat models
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        # Encoding files could not be downloaded (e.g. offline)
+        return None
+
+
+def estimate_tokens(text: str, encoder=None) -> int:
     """
-    Rough estimate of token count
-    (Actual tokenization is more complex, but this is good enough)
+    Count tokens in text
+    
+    Exact when a tiktoken encoder is given, otherwise a rough estimate
+    (1 token ≈ 4 characters), which is good enough for progress messages.
     
     Args:
-        text: Text to estimate tokens for
+        text: Text to count tokens for
+        encoder: tiktoken encoder from get_encoder (optional)
         
     Returns:
-        Estimated token count
+        Token count
     """
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    
     # Rough estimate: 1 token ≈ 4 characters or 0.75 words
-    return int(len(text) / 4)
+    return len(text) // 4
 
 
-def truncate_text(text: str, max_tokens: int = 6000) -> tuple[str, bool]:
+def count_tokens_batch(texts: list[str], encoder=None) -> list[int]:
+    """
+    Count tokens for many texts at once
+    
+    With an encoder, all texts are tokenized in one encode_batch call that
+    runs across threads; otherwise each count is estimated.
+    
+    Args:
+        texts: Texts to count tokens for
+        encoder: tiktoken encoder from get_encoder (optional)
+        
+    Returns:
+        Token count per text, in the same order
+    """
+    if encoder is not None:
+        token_ids = encoder.encode_batch(texts, num_threads=os.cpu_count() or 1, disallowed_special=())
+        return [len(ids) for ids in token_ids]
+    
+    return [len(text) // 4 for text in texts]
+
+
+_TRUNCATION_NOTE = "\n\n[Note: Input was truncated due to length]"
+
+# End of a sentence: ., ! or ? followed by whitespace (not "3.5" or "v2.1")
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+
+def truncate_text(text: str, max_tokens: int = 6000, encoder=None) -> tuple[str, bool]:
     """
     Truncate text if it exceeds max tokens
     
     Args:
         text: Text to potentially truncate
         max_tokens: Maximum tokens allowed
+        encoder: tiktoken encoder from get_encoder (optional, for an exact cut)
         
     Returns:
         Tuple of (text, was_truncated)
     """
-    estimated_tokens = estimate_tokens(text)
+    if encoder is not None:
+        # Encode once and cut at exactly max_tokens
+        tokens = encoder.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text, False
+        
+        # Only the length is taken: the cut is made in the original text,
+        # so the boundary search below can see what follows it
+        max_chars = len(encoder.decode(tokens[:max_tokens]))
+    else:
+        # Same estimate as estimate_tokens (1 token ≈ 4 characters)
+        if len(text) // 4 <= max_tokens:
+            return text, False
+        
+        max_chars = max_tokens * 4
+    
+    # Try to cut at a sentence boundary in the last 20%. Only that window of
+    # the uncut text is searched, one character further so that a "." right
+    # at the cut (as in "v2.0") isn't taken for a sentence end; only the
+    # final slice is copied
+    end = max_chars
+    for match in _SENTENCE_END.finditer(text, int(max_chars * 0.8) + 1, max_chars + 1):
+        if match.start() < max_chars:
+            end = match.end()
+    
+    # join sizes the result once, rather than relying on CPython's in-place
+    # concatenation shortcut
+    return "".join((text[:end], _TRUNCATION_NOTE)), True
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    """Import orjson on first use (None if it isn't installed)"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    
+    return orjson
+
+
+def dumps_jsonl(records: list) -> bytes:
+    """
+    Serialize records as JSON Lines
     
-    if estimated_tokens <= max_tokens:
-        return text, False
+    Uses orjson when installed (several times faster), else the json module.
     
-    # Truncate to roughly max_tokens
-    max_chars = max_tokens * 4
-    truncated = text[:max_chars]
+    Args:
+        records: JSON-serializable objects, one per line
+        
+    Returns:
+        UTF-8 encoded JSONL
+    """
+    orjson = _orjson()
+    if orjson is not None:
+        return b"\n".join(orjson.dumps(record) for record in records)
     
-    # Try to truncate at a sentence boundary
-    last_period = truncated.rfind('.')
-    if last_period > max_chars * 0.8:  # If we found a period in the last 20%
-        truncated = truncated[:last_period + 1]
+    import json
+    return "\n".join(json.dumps(record) for record in records).encode('utf-8')
+
+
+def loads_json(data):
+    """
+    Parse a JSON document (str or bytes)
     
-    truncated += "\n\n[Note: Input was truncated due to length]"
+    Uses orjson when installed, else the json module. Both raise a
+    json.JSONDecodeError for invalid input.
+    """
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.loads(data)
     
-    return truncated, True
+    import json
+    return json.loads(data)
+
+
+_SEPARATOR = "\n" + "=" * 70 + "\n"
 
 
 def format_output_separator() -> str:
     """Return a nice separator for output"""
-    return "\n" + "="*70 + "\n"
+    return _SEPARATOR
 
 
 def print_success(message: str):